@@ -0,0 +1,125 @@
+# backtester/_kernels.py
+# Numba-compiled kernels for the hot, path-dependent portion of a backtest.
+# The portfolio state update (cash/position bookkeeping) is inherently sequential,
+# so it cannot be vectorized — but it can be compiled to machine code.
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is in requirements, but the kernels still work without it
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator so the kernels run as plain Python if numba is missing."""
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
+
+
+@njit(cache=True, fastmath=True)
+def simulate(close, signals, amount, initial_balance_usd):
+    """
+    Walks the price/signal arrays once and applies the same bookkeeping rules as
+    PortfolioManager.execute_trade: a buy signal adds `amount` units if cash allows,
+    a sell signal flattens the whole position if one is held.
+    Args:
+        close (np.ndarray): float64 close prices.
+        signals (np.ndarray): int8 signals in {-1, 0, +1}.
+        amount (float): Fixed order size in units per buy signal.
+        initial_balance_usd (float): Starting cash balance.
+    Returns:
+        tuple: (cash_series, position_series, trade_idx, trade_px, trade_sz) where the
+               trade arrays are sparse (one entry per executed trade) and trade_sz is
+               signed (+ for buys, - for sells).
+    """
+    n = close.shape[0]
+    cash_series = np.empty(n, dtype=np.float64)
+    position_series = np.empty(n, dtype=np.float64)
+    trade_idx = np.empty(n, dtype=np.int64)
+    trade_px = np.empty(n, dtype=np.float64)
+    trade_sz = np.empty(n, dtype=np.float64)
+
+    cash = initial_balance_usd
+    position = 0.0
+    n_trades = 0
+    for i in range(n):
+        price = close[i]
+        sig = signals[i]
+        if sig == 1:
+            cost = amount * price
+            if cash >= cost:
+                cash -= cost
+                position += amount
+                trade_idx[n_trades] = i
+                trade_px[n_trades] = price
+                trade_sz[n_trades] = amount
+                n_trades += 1
+        elif sig == -1:
+            if position > 0.0:
+                cash += position * price
+                trade_idx[n_trades] = i
+                trade_px[n_trades] = price
+                trade_sz[n_trades] = -position
+                n_trades += 1
+                position = 0.0
+        cash_series[i] = cash
+        position_series[i] = position
+
+    return cash_series, position_series, trade_idx[:n_trades], trade_px[:n_trades], trade_sz[:n_trades]
+
+
+@lru_cache(maxsize=8)
+def specialize(amount):
+    """
+    Builds a simulate() variant with the fixed order size baked into the compiled
+    code as a constant (Numba freezes closure variables at compile time), removing
+    the sizing argument load/multiply from the inner loop. Cached per amount, so a
+    sweep over many strategies with the same sizing compiles exactly once.
+    Args:
+        amount (float): Fixed order size in units per buy signal.
+    Returns:
+        callable: kernel(close, signals, initial_balance_usd) with the same return
+                  contract as simulate().
+    """
+    amount = float(amount)
+
+    @njit(fastmath=True)
+    def simulate_fixed(close, signals, initial_balance_usd):
+        n = close.shape[0]
+        cash_series = np.empty(n, dtype=np.float64)
+        position_series = np.empty(n, dtype=np.float64)
+        trade_idx = np.empty(n, dtype=np.int64)
+        trade_px = np.empty(n, dtype=np.float64)
+        trade_sz = np.empty(n, dtype=np.float64)
+
+        cash = initial_balance_usd
+        position = 0.0
+        n_trades = 0
+        for i in range(n):
+            price = close[i]
+            sig = signals[i]
+            if sig == 1:
+                cost = amount * price
+                if cash >= cost:
+                    cash -= cost
+                    position += amount
+                    trade_idx[n_trades] = i
+                    trade_px[n_trades] = price
+                    trade_sz[n_trades] = amount
+                    n_trades += 1
+            elif sig == -1:
+                if position > 0.0:
+                    cash += position * price
+                    trade_idx[n_trades] = i
+                    trade_px[n_trades] = price
+                    trade_sz[n_trades] = -position
+                    n_trades += 1
+                    position = 0.0
+            cash_series[i] = cash
+            position_series[i] = position
+
+        return cash_series, position_series, trade_idx[:n_trades], trade_px[:n_trades], trade_sz[:n_trades]
+
+    return simulate_fixed
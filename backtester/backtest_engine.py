@@ -1,18 +1,53 @@
 import pandas as pd
+import numpy as np
 from trading_core.portfolio_manager import PortfolioManager
 from trading_core.event_logger import EventLogger
 from utils.logger import logger
 import time  # For simulating backtest speed
 
 from regime_info.historical_regime_provider import HistoricalRegimeProvider
+from backtester._kernels import specialize
 import datetime
 
 class BacktestEngine:
-    def __init__(self):
+    # Structured dtype for the preallocated trade-log buffer (SoA layout, one row per fill)
+    _TRADE_DTYPE = np.dtype([
+        ('timestamp', 'datetime64[ns]'), ('type', 'U4'), ('symbol', 'U12'),
+        ('amount', 'f8'), ('price', 'f8'), ('usd_value', 'f8')
+    ])
+
+    def __init__(self, event_log_filename='backtest_transactions.csv'):
         self.portfolio_manager = PortfolioManager()  # Each backtest starts with a fresh portfolio
-        self.event_logger = EventLogger(filename='backtest_transactions.csv')  # Separate log file for backtests
+        self.event_log_filename = event_log_filename  # Parallel workers pass a per-worker filename to avoid write races
+        self.event_logger = EventLogger(filename=event_log_filename)  # Separate log file for backtests
+        self._trade_buf = None  # Allocated per backtest, sized to the bar count
+        self._n_trades = 0
         logger.info("BacktestEngine initialized.")
 
+    def _init_trade_buffer(self, capacity):
+        """Preallocates the trade-log buffer: at most one fill per bar in the common case."""
+        self._trade_buf = np.empty(max(capacity, 1), dtype=self._TRADE_DTYPE)
+        self._n_trades = 0
+
+    def _record_trade(self, timestamp, order_type, symbol, amount, price):
+        """Appends one fill to the in-memory buffer — no dict allocation, no file I/O."""
+        if self._trade_buf is None:
+            self._init_trade_buffer(1)
+        if self._n_trades == len(self._trade_buf):
+            self._trade_buf = np.concatenate([self._trade_buf, np.empty(len(self._trade_buf), dtype=self._TRADE_DTYPE)])
+        row = self._trade_buf[self._n_trades]
+        row['timestamp'] = np.datetime64(timestamp)
+        row['type'] = order_type
+        row['symbol'] = symbol
+        row['amount'] = amount
+        row['price'] = price
+        row['usd_value'] = amount * price
+        self._n_trades += 1
+
+    def _flush_trade_buffer(self):
+        """Writes the buffered trades to the transaction CSV in a single to_csv call."""
+        pd.DataFrame(self._trade_buf[:self._n_trades]).to_csv(self.event_logger.filepath, index=False)
+
     def run_backtest(
         self,
         strategy,
@@ -30,18 +65,24 @@ class BacktestEngine:
         Returns:
             dict: Backtest results summary (e.g., final balance, PnL, metrics).
         """
-        logger.info(f"Starting backtest for strategy: {strategy.get_strategy_name()}, Symbol: {strategy.get_symbol()}")
+        # Hoist the strategy accessors once; they are plain method calls but were
+        # repeated on every bar of the loop
+        symbol = strategy.get_symbol()
+        strategy_name = strategy.get_strategy_name()
+        logger.info(f"Starting backtest for strategy: {strategy_name}, Symbol: {symbol}")
         start_time = time.time()
 
         self.portfolio_manager = PortfolioManager(initial_balance_usd=initial_balance_usd)  # Reset portfolio for each backtest
-        self.event_logger = EventLogger(filename='backtest_transactions.csv')  # New event logger instance
+        self.event_logger.reset()  # Reuse the logger; just start a fresh log file
 
         if historical_data.empty:
             logger.warning("Historical data is empty. Backtest cannot be run.")
             return {'status': 'error', 'message': 'No historical data provided'}
 
-        # Ensure historical_data is sorted by timestamp (important for sequential backtesting)
-        historical_data = historical_data.sort_index()
+        # Ensure historical_data is sorted by timestamp (important for sequential backtesting).
+        # sort_index() copies even when already sorted, so only sort when actually needed.
+        if not historical_data.index.is_monotonic_increasing:
+            historical_data = historical_data.sort_index()
 
         # If requested, fetch historical regime data for the same date range and merge into DataFrame
         if use_historical_regime:
@@ -60,7 +101,7 @@ class BacktestEngine:
 
                 # Fetch the regime data
                 regime_data_list = hrp.fetch_historical_regime_data(
-                    symbol=strategy.get_symbol(),
+                    symbol=symbol,
                     start_date=start_dt,
                     end_date=end_dt,
                     interval="1d"
@@ -69,65 +110,113 @@ class BacktestEngine:
                 df_regime = pd.DataFrame(regime_data_list)
                 df_regime['timestamp'] = pd.to_datetime(df_regime['timestamp'])
                 df_regime.set_index('timestamp', inplace=True)
-                # We'll add the regime_label to our historical_data
-                historical_data = historical_data.join(df_regime['regime_label'], how='left')
+                # Categorical dtype: the label is read on every bar, and category codes are
+                # far smaller and faster to compare than per-row Python strings
+                df_regime['regime_label'] = df_regime['regime_label'].astype('category')
+                if not df_regime.index.is_monotonic_increasing:
+                    df_regime = df_regime.sort_index()
+                # merge_asof requires both datetime keys at the same resolution
+                # (pandas 2.x), so align the regime index to the bar index.
+                if isinstance(historical_data.index, pd.DatetimeIndex):
+                    df_regime.index = df_regime.index.as_unit(historical_data.index.unit)
+                # Merge the regime_label into historical_data with merge_asof: each bar
+                # takes the most recent label at or before its timestamp. Regime labels are
+                # stepwise constant, so backward-fill semantics also handle mismatched
+                # frequencies, and the ordered merge avoids an exact-key hash join.
+                index_name = historical_data.index.name or 'index'
+                historical_data = pd.merge_asof(
+                    historical_data.reset_index(),
+                    df_regime[['regime_label']].reset_index(),
+                    left_on=index_name, right_on='timestamp',
+                    direction='backward'
+                ).drop(columns='timestamp').set_index(index_name)
                 logger.info("Historical regime data successfully merged into backtest dataset.")
             except Exception as e:
                 logger.warning(f"Failed to fetch/merge historical regime data: {e}")
 
+        # Cache column positions once so the loop can index plain tuples (itertuples
+        # avoids the per-row Series construction overhead of iterrows).
+        close_pos = historical_data.columns.get_loc('close') + 1  # +1 for the index slot
+        has_regime = 'regime_label' in historical_data.columns
+        regime_pos = historical_data.columns.get_loc('regime_label') + 1 if has_regime else None
+
+        self._init_trade_buffer(len(historical_data))
+
+        # Ask the strategy for its full signal series up front (indicators + signals in
+        # one vectorized pass). None means the strategy only supports per-bar evaluation.
+        precomputed_signals = strategy.precompute(historical_data)
+
+        # Per-bar logging is suppressed inside the loop (formatting alone is measurable
+        # over tens of thousands of bars); counts are aggregated and logged once after.
+        hold_count = 0
+        no_position_count = 0
+        invalid_signal_count = 0
+
         # Backtesting loop (iterate through historical data points)
-        for index, row in historical_data.iterrows():
-            current_timestamp = index  # Timestamp of the current data point
-            current_price = row['close']  # Use 'close' price for signal generation and order execution simulation
+        for i, row in enumerate(historical_data.itertuples(index=True, name=None)):
+            current_timestamp = row[0]  # Timestamp of the current data point
+            current_price = row[close_pos]  # Use 'close' price for signal generation and order execution simulation
 
             # Retrieve the regime_label if present
-            regime_label = row.get('regime_label', None)
+            regime_label = row[regime_pos] if has_regime else None
 
-            # Generate trading signal from the strategy (pass regime_label optionally)
-            signal = strategy.generate_signal(historical_data.loc[:current_timestamp])
-            symbol = strategy.get_symbol()
+            # Generate trading signal from the strategy (pass regime_label optionally).
+            # The strategy gets the full DataFrame plus the current bar position instead of a
+            # growing .loc[:timestamp] slice, which copied O(N^2) rows over a whole backtest.
+            if precomputed_signals is not None:
+                sig = precomputed_signals[i]
+            else:
+                # Numeric code path: small-int compares below instead of
+                # hashing 'buy'/'sell'/'hold' strings once per bar.
+                sig = strategy.generate_signal_code(historical_data, bar_index=i)
 
             # Execute trades based on signal (in simulation)
-            if signal == 'buy':
+            if sig == 1:
                 order_params = {'order_type': 'buy', 'symbol': symbol, 'amount': 0.01, 'price': current_price}
                 trade_result = self.execute_trade(order_params, current_timestamp)
-            elif signal == 'sell':
-                positions = self.portfolio_manager.get_positions()
-                amount_to_sell = positions.get(symbol, {}).get('amount', 0)
+            elif sig == -1:
+                amount_to_sell = self.portfolio_manager.get_position_amount(symbol)
                 if amount_to_sell > 0:
                     order_params = {'order_type': 'sell', 'symbol': symbol, 'amount': amount_to_sell, 'price': current_price}
                     trade_result = self.execute_trade(order_params, current_timestamp)
                 else:
                     trade_result = {'status': 'no_position_to_sell', 'message': 'No position to sell', 'timestamp': current_timestamp}
-                    logger.info(f"Backtest: {current_timestamp} - No {symbol} position to sell, signal: {signal}")
-            elif signal == 'hold':
+                    no_position_count += 1
+            elif sig == 0:
                 trade_result = {'status': 'hold_signal', 'message': 'Hold signal', 'timestamp': current_timestamp}
-                logger.info(f"Backtest: {current_timestamp} - Hold signal from strategy.")
+                hold_count += 1
             else:
                 trade_result = {
                     'status': 'invalid_signal',
                     'message': 'Invalid signal',
                     'timestamp': current_timestamp,
-                    'signal': signal
+                    'signal': sig
                 }
-                logger.warning(f"Backtest: {current_timestamp} - Invalid signal received from strategy: {signal}")
+                invalid_signal_count += 1
 
             # Optionally simulate backtesting speed (slow down for visual inspection or debugging)
             # time.sleep(0.01)
 
+        self._flush_trade_buffer()  # One batched CSV write instead of per-trade appends
+
+        logger.info("Backtest signals: %d holds, %d sells with no position, %d invalid.",
+                    hold_count, no_position_count, invalid_signal_count)
+        if invalid_signal_count:
+            logger.warning("Strategy %s produced %d invalid signal(s).", strategy_name, invalid_signal_count)
+
         end_time = time.time()
         backtest_duration_seconds = end_time - start_time
-        logger.info(f"Backtest for strategy: {strategy.get_strategy_name()} completed in {backtest_duration_seconds:.2f} seconds.")
+        logger.info(f"Backtest for strategy: {strategy_name} completed in {backtest_duration_seconds:.2f} seconds.")
 
         # Calculate backtest summary metrics (for now, just final balance and PnL)
         initial_portfolio_value = initial_balance_usd
-        final_portfolio_value = self.portfolio_manager.get_portfolio_value({strategy.get_symbol(): current_price})
+        final_portfolio_value = self.portfolio_manager.get_portfolio_value({symbol: current_price})
         total_pnl = final_portfolio_value - initial_portfolio_value
 
         backtest_summary = {
             'status': 'completed',
-            'strategy_name': strategy.get_strategy_name(),
-            'symbol': strategy.get_symbol(),
+            'strategy_name': strategy_name,
+            'symbol': symbol,
             'initial_balance_usd': initial_balance_usd,
             'final_balance_usd': self.portfolio_manager.get_balance_usd(),
             'final_portfolio_value_usd': final_portfolio_value,
@@ -138,6 +227,101 @@ class BacktestEngine:
         logger.info(f"Backtest Summary: {backtest_summary}")
         return backtest_summary
 
+    def run_vectorized(self, strategy, historical_data: pd.DataFrame, initial_balance_usd=10000):
+        """
+        Runs a backtest as NumPy array operations instead of a per-bar Python loop.
+        Only works for strategies that implement generate_signals_vectorized (fixed
+        0.01 position sizing, same as the event-driven loop); falls back to
+        run_backtest otherwise. Thin wrapper: extracts the SoA arrays from the
+        DataFrame and delegates to run_backtest_arrays.
+        Args:
+            strategy (BaseStrategy): Strategy object to backtest.
+            historical_data (pd.DataFrame): DataFrame with historical market data (must include 'close' prices and 'timestamp' index).
+            initial_balance_usd (float): Initial portfolio balance for backtesting.
+        Returns:
+            dict: Backtest results summary (same shape as run_backtest).
+        """
+        if historical_data.empty:
+            logger.warning("Historical data is empty. Backtest cannot be run.")
+            return {'status': 'error', 'message': 'No historical data provided'}
+
+        if not historical_data.index.is_monotonic_increasing:
+            historical_data = historical_data.sort_index()
+
+        try:
+            signals = strategy.generate_signals_vectorized(historical_data)
+        except NotImplementedError:
+            logger.info(f"Strategy {strategy.get_strategy_name()} has no vectorized signals, falling back to event-driven loop.")
+            return self.run_backtest(strategy, historical_data, initial_balance_usd=initial_balance_usd)
+
+        close = historical_data['close'].to_numpy(np.float64)
+        timestamps = historical_data.index.values
+        return self.run_backtest_arrays(strategy, close, timestamps, signals, initial_balance_usd=initial_balance_usd)
+
+    def run_backtest_arrays(self, strategy, close, timestamps, signals, initial_balance_usd=10000):
+        """
+        Runs the kernel-backed backtest directly on NumPy arrays (SoA layout).
+        The hot path only reads close prices, timestamps, and signals, so callers
+        that already hold arrays skip the DataFrame and its per-access overhead
+        entirely.
+        Args:
+            strategy (BaseStrategy): Strategy object (used for name/symbol reporting).
+            close (np.ndarray): float64 close prices, time-ordered.
+            timestamps (np.ndarray): datetime64[ns] timestamps aligned with close.
+            signals (np.ndarray): int8 signals in {-1, 0, +1} aligned with close.
+            initial_balance_usd (float): Initial portfolio balance for backtesting.
+        Returns:
+            dict: Backtest results summary (same shape as run_backtest).
+        """
+        symbol = strategy.get_symbol()
+        strategy_name = strategy.get_strategy_name()
+        logger.info(f"Starting vectorized backtest for strategy: {strategy_name}, Symbol: {symbol}")
+        start_time = time.time()
+
+        self.event_logger.reset()  # Reuse the logger; just start a fresh log file
+
+        amount = 0.01  # Fixed sizing, matching the event-driven loop
+
+        # The sequential cash/position state machine is compiled with Numba; it applies
+        # the same rules as PortfolioManager.execute_trade and returns sparse trade arrays.
+        # specialize() bakes the fixed order size into the compiled kernel as a constant.
+        cash, position, trade_idx, trade_px, trade_sz = specialize(amount)(
+            close, np.asarray(signals, dtype=np.int8), float(initial_balance_usd)
+        )
+
+        # Build the whole trade log from the sparse trade arrays in one shot
+        trade_amounts = np.abs(trade_sz)
+        pd.DataFrame({
+            'timestamp': timestamps[trade_idx],
+            'type': np.where(trade_sz > 0, 'buy', 'sell'),
+            'symbol': symbol,
+            'amount': trade_amounts,
+            'price': trade_px,
+            'usd_value': trade_amounts * trade_px,
+        }).to_csv(self.event_logger.filepath, index=False)
+
+        end_time = time.time()
+        backtest_duration_seconds = end_time - start_time
+        logger.info(f"Vectorized backtest for strategy: {strategy_name} completed in {backtest_duration_seconds:.2f} seconds.")
+
+        final_balance_usd = float(cash[-1])
+        final_portfolio_value = final_balance_usd + float(position[-1] * close[-1])
+        total_pnl = final_portfolio_value - initial_balance_usd
+
+        backtest_summary = {
+            'status': 'completed',
+            'strategy_name': strategy_name,
+            'symbol': symbol,
+            'initial_balance_usd': initial_balance_usd,
+            'final_balance_usd': final_balance_usd,
+            'final_portfolio_value_usd': final_portfolio_value,
+            'total_pnl_usd': total_pnl,
+            'backtest_duration_seconds': backtest_duration_seconds,
+            'trade_history_file': self.event_logger.filepath
+        }
+        logger.info(f"Backtest Summary: {backtest_summary}")
+        return backtest_summary
+
     def execute_trade(self, order_params, timestamp):
         """
         Simulates trade execution during backtesting and updates portfolio.
@@ -155,15 +339,7 @@ class BacktestEngine:
 
         trade_successful = self.portfolio_manager.execute_trade(order_type, symbol, amount, price)
         if trade_successful:
-            trade_record = {
-                'timestamp': timestamp,
-                'type': order_type,
-                'symbol': symbol,
-                'amount': amount,
-                'price': price,
-                'usd_value': amount * price,
-            }
-            self.event_logger.log_trade(trade_record)
+            self._record_trade(timestamp, order_type, symbol, amount, price)
             return {
                 'status': 'success',
                 'message': f'Backtest: {order_type} order executed',
@@ -193,8 +369,7 @@ if __name__ == '__main__':
     interval = "1d"
     raw_historical_data = fetcher.fetch_historical_data(pair, interval=interval, limit=500)  # Get enough data for backtest
     if raw_historical_data:
-        cleaned_data = cleaner.clean_historical_data(raw_historical_data)
-        historical_df = pd.DataFrame(cleaned_data).set_index('close_timestamp')  # Use close_timestamp as index
+        historical_df = cleaner.clean_historical_data(raw_historical_data)  # Already indexed by close_timestamp
 
         # 2. Initialize strategy
         ema_strategy = EmaCrossoverStrategy(symbol=pair.replace("/", ""))
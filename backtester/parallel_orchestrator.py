@@ -0,0 +1,113 @@
+# backtester/parallel_orchestrator.py
+import os
+import importlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from utils.logger import logger
+
+DATA_CACHE_DIR = 'data/cache'
+
+
+def _run_single(strategy_name, regime, test_mode, data_cache_path, initial_balance_usd):
+    """
+    Worker entry point for one backtest. Runs in a separate process, so it loads the
+    strategy module and the cached historical data itself instead of receiving pickled
+    objects from the parent.
+    Args:
+        strategy_name (str): Name of the strategy file (e.g., 'ema_crossover').
+        regime (str): Regime folder where the strategy is located (e.g., 'bull').
+        test_mode (bool): If True, loads from to_test folder instead of approved.
+        data_cache_path (str): Path to the pickled historical DataFrame shared by all workers.
+        initial_balance_usd (float): Initial portfolio balance for the backtest.
+    Returns:
+        dict: Backtest results summary from BacktestEngine.run_backtest.
+    """
+    from backtester.backtest_engine import BacktestEngine
+
+    folder = 'to_test' if test_mode else 'approved'
+    strategy_module = importlib.import_module(f'strategy.{folder}.{regime}.{strategy_name}')
+    strategy_class = getattr(strategy_module, "Strategy")
+    strategy = strategy_class(name=strategy_name, symbol="BTCUSDT")
+
+    historical_data = pd.read_pickle(data_cache_path)
+
+    # Per-worker transaction log so concurrent workers never append to the same CSV
+    engine = BacktestEngine(event_log_filename=f'backtest_transactions_{os.getpid()}.csv')
+    return engine.run_backtest(strategy, historical_data, initial_balance_usd=initial_balance_usd)
+
+
+class ParallelOrchestrator:
+    """
+    Fans independent backtests out across processes. Individual backtests are
+    path-dependent and must stay sequential internally, but different
+    strategy/regime combinations have no shared state, so sweeps scale
+    near-linearly with core count.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count()
+        logger.info(f"ParallelOrchestrator initialized with {self.max_workers} workers.")
+
+    def run_backtests(self, jobs, historical_data, initial_balance_usd=10000):
+        """
+        Runs a batch of backtests in parallel over the same historical data.
+        Args:
+            jobs (list): List of (strategy_name, regime, test_mode) tuples.
+            historical_data (pd.DataFrame): Historical market data shared by all jobs.
+                Written once to an on-disk cache and re-read by each worker, so the
+                frame is not re-pickled per job.
+            initial_balance_usd (float): Initial portfolio balance for each backtest.
+        Returns:
+            dict: Maps (strategy_name, regime) to the backtest results summary
+                  (or an error dict if that job raised).
+        """
+        os.makedirs(DATA_CACHE_DIR, exist_ok=True)
+        data_cache_path = os.path.join(DATA_CACHE_DIR, 'backtest_historical_data.pkl')
+        historical_data.to_pickle(data_cache_path)
+
+        results = {}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_job = {
+                executor.submit(_run_single, strategy_name, regime, test_mode, data_cache_path, initial_balance_usd):
+                    (strategy_name, regime)
+                for strategy_name, regime, test_mode in jobs
+            }
+            for future in as_completed(future_to_job):
+                job_key = future_to_job[future]
+                try:
+                    results[job_key] = future.result()
+                    logger.info(f"Backtest completed for strategy: {job_key[0]}, regime: {job_key[1]}")
+                except Exception as e:
+                    logger.error(f"Backtest failed for strategy: {job_key[0]}, regime: {job_key[1]}: {e}")
+                    results[job_key] = {'status': 'error', 'message': str(e)}
+        return results
+
+
+if __name__ == '__main__':
+    # Example parallel sweep over all strategies in the to_test folder:
+    import data_module.data_fetcher
+    import data_module.data_cleaner
+
+    fetcher = data_module.data_fetcher.DataFetcher()
+    cleaner = data_module.data_cleaner.DataCleaner()
+    raw_historical_data = fetcher.fetch_historical_data("BTC/USDT", interval="1d", limit=500)
+    if raw_historical_data:
+        historical_df = cleaner.clean_historical_data(raw_historical_data)
+
+        jobs = []
+        to_test_path = "strategy/to_test"
+        for regime_folder in os.listdir(to_test_path):
+            strategy_dir = os.path.join(to_test_path, regime_folder)
+            if not os.path.isdir(strategy_dir):
+                continue
+            for f in os.listdir(strategy_dir):
+                if f.endswith('.py') and not f.startswith('_'):
+                    jobs.append((f[:-3], regime_folder, True))
+
+        orchestrator = ParallelOrchestrator()
+        results = orchestrator.run_backtests(jobs, historical_df)
+        for (strategy_name, regime), summary in results.items():
+            print(f"{strategy_name} ({regime}): {summary.get('status')}, PnL: {summary.get('total_pnl_usd')}")
+    else:
+        print("Failed to fetch historical data for parallel backtest example.")
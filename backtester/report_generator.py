@@ -67,8 +67,7 @@ if __name__ == '__main__':
     interval = "1d"
     raw_historical_data = fetcher.fetch_historical_data(pair, interval=interval, limit=500)
     if raw_historical_data:
-        cleaned_data = cleaner.clean_historical_data(raw_historical_data)
-        historical_df = pd.DataFrame(cleaned_data).set_index('close_timestamp')
+        historical_df = cleaner.clean_historical_data(raw_historical_data)
         ema_strategy = EmaCrossoverStrategy(symbol=pair.replace("/", ""))
         backtest_engine = BacktestEngine()
         backtest_results = backtest_engine.run_backtest(ema_strategy, historical_df, initial_balance_usd=10000)
@@ -0,0 +1,88 @@
+# backtester/runner.py
+# Loads a strategy, fetches its data, and drives a single backtest end to end.
+# Lives here (not in main.py) so the entry point only orchestrates.
+import importlib
+from functools import lru_cache
+
+from utils.logger import logger
+from data_module.data_fetcher import DataFetcher
+from data_module.data_cleaner import DataCleaner
+from backtester.backtest_engine import BacktestEngine
+from backtester.report_generator import ReportGenerator
+
+
+@lru_cache(maxsize=None)
+def _load_strategy_class(folder, regime, strategy_name):
+    """
+    Imports a strategy module and returns its Strategy class, caching the result
+    so sweep runs over many regimes/strategies pay the path walk and module exec
+    only once per strategy.
+    """
+    strategy_module = importlib.import_module(f'strategy.{folder}.{regime}.{strategy_name}')
+    return getattr(strategy_module, "Strategy")
+
+
+def run_backtest(strategy_name, regime, test_mode=False, strategy_class=None):
+    """
+    Runs backtest for a given strategy.
+    Args:
+        strategy_name (str): Name of the strategy file (e.g., 'ema_crossover').
+        regime (str): Regime folder where strategy is located (e.g., 'bull').
+        test_mode (bool): If True, loads from to_test folder instead of approved.
+        strategy_class (type, optional): Preloaded Strategy class; skips the
+            dynamic import when the caller has already bulk-loaded it.
+    """
+    logger.info(f"Starting backtest run for strategy: {strategy_name} in regime: {regime}")
+
+    # 1. Load Strategy dynamically
+    try:
+        folder = 'to_test' if test_mode else 'approved'
+        if strategy_class is None:
+            if test_mode:
+                importlib.invalidate_caches()  # Pick up strategy files dropped in since startup
+            strategy_class = _load_strategy_class(folder, regime, strategy_name)
+
+        # Validate strategy
+        from strategy.strategy_validator import StrategyValidator
+        is_valid, msg = StrategyValidator.validate_strategy(strategy_class)
+        if not is_valid:
+            logger.error(f"Strategy validation failed: {msg}")
+            return
+
+        strategy = strategy_class(name=strategy_name, symbol="BTCUSDT")
+        logger.info(f"Successfully loaded strategy: {strategy_name} from strategy/{folder}/{regime}/{strategy_name}.py")
+
+    except (ImportError, AttributeError) as e:
+        logger.error(f"Error loading strategy {strategy_name} from strategy/{folder}/{regime}: {e}")
+        return
+
+    # 2. Fetch historical data (for BTCUSDT, adjust as needed)
+    fetcher = DataFetcher()
+    cleaner = DataCleaner()
+    pair = "BTC/USDT"  # Example pair, could be parameterized
+    interval = "1d"  # Example interval, could be parameterized
+    raw_historical_data = fetcher.fetch_historical_data(pair, interval=interval, limit=500)  # Get enough data for backtest
+    if not raw_historical_data:
+        logger.error(f"Failed to fetch historical data for {pair}. Backtest aborted.")
+        return
+    historical_df = cleaner.clean_historical_data(raw_historical_data)
+
+    # 3. Initialize Backtest Engine and Report Generator
+    backtest_engine = BacktestEngine()
+    report_generator = ReportGenerator()
+
+    # 4. Run Backtest
+    backtest_results = backtest_engine.run_backtest(strategy, historical_df, initial_balance_usd=10000)
+
+    # 5. Generate and Save Report
+    if backtest_results['status'] == 'completed':
+        report_text = report_generator.generate_report(backtest_results)
+        print(report_text)  # Print to console
+        report_filepath = report_generator.save_report_to_file(report_text)
+        if report_filepath:
+            logger.info(f"Backtest report saved to: {report_filepath}")
+        else:
+            logger.error("Failed to save backtest report to file.")
+    else:
+        logger.error("Backtest run failed. No report generated.")
+        print("Backtest Failed. Check logs for details.")
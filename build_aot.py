@@ -0,0 +1,36 @@
+# build_aot.py
+"""
+Ahead-of-time build for the hot numeric kernels.
+
+Run `python build_aot.py` once per environment to produce a
+`the_hand_kernels` extension module next to this script. Modules that use
+the kernels (trading_core.portfolio_manager) import the AOT build when it
+exists and fall back to their @njit definitions otherwise, so the build is
+optional — it just moves the JIT compile/cache-load cost out of process
+startup, which matters for sweeps spawning many short-lived workers.
+"""
+from numba.pycc import CC
+
+cc = CC('the_hand_kernels')
+
+
+@cc.export('value_and_pnl', 'Tuple((f8, f8))(f8[:], f8[:], f8[:], f8[:])')
+def value_and_pnl(amounts, avg_prices, prices, pnl_out):
+    """AOT twin of portfolio_manager._value_and_pnl — keep the bodies in
+    sync. Skips NaN (missing) prices, writing 0 to their PnL slots."""
+    value = 0.0
+    total_pnl = 0.0
+    for i in range(amounts.shape[0]):
+        if prices[i] == prices[i]:  # not NaN
+            value += amounts[i] * prices[i]
+            pnl = amounts[i] * (prices[i] - avg_prices[i])
+            pnl_out[i] = pnl
+            total_pnl += pnl
+        else:
+            pnl_out[i] = 0.0
+    return value, total_pnl
+
+
+if __name__ == '__main__':
+    cc.compile()
+    print(f"Built {cc.name} extension.")
@@ -1,32 +1,78 @@
 # config.py
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 load_dotenv()
-MODE = os.getenv("MODE", "simulation")
-ASSET_PAIRS = os.getenv("ASSET_PAIRS", "BTC/USDT,ETH/USDT").split(",")
-RISK_TOLERANCE = float(os.getenv("RISK_TOLERANCE", 0.02))
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-DATA_SOURCE = os.getenv("DATA_SOURCE", "binance")
 
-RUN_MODE = os.getenv("RUN_MODE") # Default to 'strategist' run
-print(RUN_MODE)
-INTEGRATION_DEMO_TEST = os.getenv("INTEGRATION_DEMO_TEST", "False")
-BACKTEST_STRATEGY = os.getenv("BACKTEST_STRATEGY", "all") # Strategy name for backtesting
-BACKTEST_REGIME = os.getenv("BACKTEST_REGIME", "bull") # Regime for backtesting
 
-# Strategy approval thresholds
-MIN_SHARPE_RATIO = float(os.getenv('MIN_SHARPE_RATIO', 1.0))
-MAX_DRAWDOWN = float(os.getenv('MAX_DRAWDOWN', 0.2))  # 20% max drawdown
-MIN_WIN_RATE = float(os.getenv('MIN_WIN_RATE', 0.55))  # 55% win rate
+@dataclass(frozen=True, slots=True)
+class _Config:
+    """All environment-derived settings, parsed once at import time and frozen."""
+    MODE: str
+    ASSET_PAIRS: tuple
+    RISK_TOLERANCE: float
+    LOG_LEVEL: str
+    DATA_SOURCE: str
+    RUN_MODE: str
+    INTEGRATION_DEMO_TEST: str
+    BACKTEST_STRATEGY: str
+    BACKTEST_REGIME: str
+    MIN_SHARPE_RATIO: float
+    MAX_DRAWDOWN: float
+    MIN_WIN_RATE: float
+    BACKTEST_START_DATE: str
+    BACKTEST_END_DATE: str
+    BACKTEST_INITIAL_BALANCE: float
+    MACRO_API_KEY: str
+    DEMO_EXCHANGE_API_KEY: str
+    DEMO_EXCHANGE_API_SECRET: str
 
-# Backtest parameters
-BACKTEST_START_DATE = os.getenv('BACKTEST_START_DATE', '2024-01-01')
-BACKTEST_END_DATE = os.getenv('BACKTEST_END_DATE', '2024-12-31')
-BACKTEST_INITIAL_BALANCE = float(os.getenv('BACKTEST_INITIAL_BALANCE', 10000.0))
+    @classmethod
+    def from_env(cls):
+        return cls(
+            MODE=os.getenv("MODE", "simulation"),
+            ASSET_PAIRS=tuple(os.getenv("ASSET_PAIRS", "BTC/USDT,ETH/USDT").split(",")),
+            RISK_TOLERANCE=float(os.getenv("RISK_TOLERANCE", 0.02)),
+            LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO"),
+            DATA_SOURCE=os.getenv("DATA_SOURCE", "binance"),
+            RUN_MODE=os.getenv("RUN_MODE"),  # Default to 'strategist' run
+            INTEGRATION_DEMO_TEST=os.getenv("INTEGRATION_DEMO_TEST", "False"),
+            BACKTEST_STRATEGY=os.getenv("BACKTEST_STRATEGY", "all"),  # Strategy name for backtesting
+            BACKTEST_REGIME=os.getenv("BACKTEST_REGIME", "bull"),  # Regime for backtesting
+            # Strategy approval thresholds
+            MIN_SHARPE_RATIO=float(os.getenv('MIN_SHARPE_RATIO', 1.0)),
+            MAX_DRAWDOWN=float(os.getenv('MAX_DRAWDOWN', 0.2)),  # 20% max drawdown
+            MIN_WIN_RATE=float(os.getenv('MIN_WIN_RATE', 0.55)),  # 55% win rate
+            # Backtest parameters
+            BACKTEST_START_DATE=os.getenv('BACKTEST_START_DATE', '2024-01-01'),
+            BACKTEST_END_DATE=os.getenv('BACKTEST_END_DATE', '2024-12-31'),
+            BACKTEST_INITIAL_BALANCE=float(os.getenv('BACKTEST_INITIAL_BALANCE', 10000.0)),
+            MACRO_API_KEY=os.getenv("MACRO_API_KEY"),  # API key for macro data
+            # Phase 8 demo exchange credentials
+            DEMO_EXCHANGE_API_KEY=os.getenv("DEMO_EXCHANGE_API_KEY", ""),
+            DEMO_EXCHANGE_API_SECRET=os.getenv("DEMO_EXCHANGE_API_SECRET", ""),
+        )
 
-MACRO_API_KEY = os.getenv("MACRO_API_KEY") # API key for macro data
 
-# Phase 8 demo exchange credentials
-DEMO_EXCHANGE_API_KEY = os.getenv("DEMO_EXCHANGE_API_KEY", "")
-DEMO_EXCHANGE_API_SECRET = os.getenv("DEMO_EXCHANGE_API_SECRET", "")
\ No newline at end of file
+CFG = _Config.from_env()
+
+# Module-level aliases so existing `config.X` call sites keep working
+MODE = CFG.MODE
+ASSET_PAIRS = CFG.ASSET_PAIRS
+RISK_TOLERANCE = CFG.RISK_TOLERANCE
+LOG_LEVEL = CFG.LOG_LEVEL
+DATA_SOURCE = CFG.DATA_SOURCE
+RUN_MODE = CFG.RUN_MODE
+INTEGRATION_DEMO_TEST = CFG.INTEGRATION_DEMO_TEST
+BACKTEST_STRATEGY = CFG.BACKTEST_STRATEGY
+BACKTEST_REGIME = CFG.BACKTEST_REGIME
+MIN_SHARPE_RATIO = CFG.MIN_SHARPE_RATIO
+MAX_DRAWDOWN = CFG.MAX_DRAWDOWN
+MIN_WIN_RATE = CFG.MIN_WIN_RATE
+BACKTEST_START_DATE = CFG.BACKTEST_START_DATE
+BACKTEST_END_DATE = CFG.BACKTEST_END_DATE
+BACKTEST_INITIAL_BALANCE = CFG.BACKTEST_INITIAL_BALANCE
+MACRO_API_KEY = CFG.MACRO_API_KEY
+DEMO_EXCHANGE_API_KEY = CFG.DEMO_EXCHANGE_API_KEY
+DEMO_EXCHANGE_API_SECRET = CFG.DEMO_EXCHANGE_API_SECRET
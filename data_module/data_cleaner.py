@@ -1,46 +1,92 @@
 # data_module/data_cleaner.py
 import datetime
+import numpy as np
+import pandas as pd
 from utils.logger import logger
 
 class DataCleaner:
+    # Binance kline column order
+    _KLINE_COLUMNS = [
+        'open_timestamp', 'open', 'high', 'low', 'close', 'volume',
+        'close_timestamp', 'quote_asset_volume', 'trades',
+        'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
+    ]
+    _NUMERIC_COLUMNS = [
+        'open', 'high', 'low', 'close', 'volume', 'quote_asset_volume',
+        'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume'
+    ]
+
     def __init__(self):
         logger.info("DataCleaner initialized.")
 
     def clean_historical_data(self, raw_data):
         """
         Cleans and normalizes historical candlestick data from Binance.
+        All conversions run as vectorized column operations instead of a per-candle
+        Python loop; malformed candles are masked out in one pass with
+        pd.to_numeric(errors='coerce') and dropped.
         Args:
             raw_data (list): Raw candlestick data from Binance API.
         Returns:
-            list: Cleaned data as a list of dictionaries.
+            pd.DataFrame: Cleaned data indexed by close_timestamp with explicit dtypes
+                          (float64 prices/volumes, int64 trades, datetime64 timestamps).
+                          Empty DataFrame if no data. Callers no longer need to rebuild
+                          a frame with pd.DataFrame(...).set_index('close_timestamp').
         """
-        cleaned_data = []
         if not raw_data:
-            return cleaned_data  # Return empty list if no data
+            return pd.DataFrame()  # Return empty DataFrame if no data
 
-        for candle in raw_data:
-            try:
-                cleaned_candle = {
-                    "open_timestamp": datetime.datetime.fromtimestamp(candle[0]/1000.0), # Convert ms to seconds
-                    "open": float(candle[1]),
-                    "high": float(candle[2]),
-                    "low": float(candle[3]),
-                    "close": float(candle[4]),
-                    "volume": float(candle[5]),
-                    "close_timestamp": datetime.datetime.fromtimestamp(candle[6]/1000.0),
-                    "quote_asset_volume": float(candle[7]),
-                    "trades": int(candle[8]),
-                    "taker_buy_base_asset_volume": float(candle[9]),
-                    "taker_buy_quote_asset_volume": float(candle[10]),
-                    "ignore": candle[11] # Or can be ignored
-                }
-                cleaned_data.append(cleaned_candle)
-            except (ValueError, IndexError) as e:
-                logger.error(f"Error cleaning candle data: {e}. Raw candle: {candle}")
-                continue # Skip problematic candle and continue
+        df = pd.DataFrame(raw_data, columns=self._KLINE_COLUMNS)
+
+        # Vectorized numeric and timestamp conversions (malformed values become NaN/NaT)
+        df[self._NUMERIC_COLUMNS] = df[self._NUMERIC_COLUMNS].apply(pd.to_numeric, errors='coerce')
+        df['trades'] = pd.to_numeric(df['trades'], errors='coerce')
+        df['open_timestamp'] = pd.to_datetime(pd.to_numeric(df['open_timestamp'], errors='coerce'), unit='ms')
+        df['close_timestamp'] = pd.to_datetime(pd.to_numeric(df['close_timestamp'], errors='coerce'), unit='ms')
+
+        # Drop candles where any converted field failed, mirroring the old per-candle skip
+        malformed = df.drop(columns='ignore').isna().any(axis=1)
+        if malformed.any():
+            logger.error(f"Dropped {int(malformed.sum())} malformed candle(s) during cleaning.")
+            df = df[~malformed]
+        df['trades'] = df['trades'].astype('int64')
+
+        df.set_index('close_timestamp', inplace=True)
+        logger.info(f"Cleaned {len(df)} candlestick data points.")
+        return df
 
-        logger.info(f"Cleaned {len(cleaned_data)} candlestick data points.")
-        return cleaned_data
+    def clean_historical_columns(self, raw_data):
+        """
+        Cleans historical candlestick data into plain NumPy column arrays.
+        The strategist's per-pair loop only reads price columns, so it can skip
+        DataFrame construction (column inference, block allocation) entirely;
+        callers that need an indexed frame — the backtester — keep using
+        clean_historical_data.
+        Args:
+            raw_data (list): Raw candlestick data from Binance API.
+        Returns:
+            dict: Column name -> ndarray with 'close_timestamp' (int64 epoch ms)
+                  and 'open'/'high'/'low'/'close'/'volume' (float64).
+                  Empty dict if no data.
+        """
+        if not raw_data:
+            return {}
+        try:
+            arr = np.array(raw_data, dtype=object)
+            columns = {'close_timestamp': arr[:, 6].astype(np.int64)}
+            for name, idx in (('open', 1), ('high', 2), ('low', 3), ('close', 4), ('volume', 5)):
+                columns[name] = arr[:, idx].astype(np.float64)
+        except (ValueError, TypeError):
+            # Malformed candles somewhere in the batch: fall back to the
+            # masking DataFrame path and pull the columns out of it.
+            df = self.clean_historical_data(raw_data)
+            if df.empty:
+                return {}
+            columns = {'close_timestamp': df.index.values.astype('datetime64[ms]').view(np.int64)}
+            for name in ('open', 'high', 'low', 'close', 'volume'):
+                columns[name] = df[name].to_numpy(np.float64)
+        logger.info(f"Cleaned {len(columns['close'])} candlestick data points (columnar).")
+        return columns
 
     def clean_realtime_data(self, raw_realtime_data):
         """
@@ -73,8 +119,7 @@ if __name__ == '__main__':
     if raw_historical_data:
         cleaned_historical_data = cleaner.clean_historical_data(raw_historical_data)
         print("Cleaned Historical Data (first 2 candles):")
-        for i in range(min(2, len(cleaned_historical_data))): # Print only first 2 for brevity
-            print(cleaned_historical_data[i])
+        print(cleaned_historical_data.head(2)) # Print only first 2 for brevity
 
     raw_realtime_data = fetcher.fetch_realtime_data("ETH/USDT")
     cleaned_realtime_data = cleaner.clean_realtime_data(raw_realtime_data)
@@ -1,26 +1,96 @@
 # data_module/data_fetcher.py
+import asyncio
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import aiohttp
+import httpx
+import orjson
 from utils.logger import logger
-import time
-import config
-from data_module.database_handler import DatabaseHandler
+import numpy as np
+import pandas as pd
+from data_module.database_handler import get_db
+from utils.cache import FileCache
+from utils.ratelimit import TokenBucket
+
+# Connect timeout / read timeout for all exchange API calls (seconds)
+REQUEST_TIMEOUT = (3.05, 15)
+
+_BINANCE_BASE_URL = "https://api.binance.com/api/v3"
+_COINBASE_BASE_URL = "https://api.coinbase.com/v2"
+
+# Common interval notation -> Coinbase granularity (seconds per candle)
+_COINBASE_GRANULARITY = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "6h": 21600,
+    "1d": 86400,
+}
+
+def _insert_or_ignore(table, conn, keys, data_iter):
+    """to_sql insert method: INSERT OR IGNORE so the (symbol, open_time) primary
+    key silently drops rows already ingested by an overlapping fetch."""
+    placeholders = ', '.join(['?'] * len(keys))
+    sql = f"INSERT OR IGNORE INTO {table.name} ({', '.join(keys)}) VALUES ({placeholders})"
+    conn.executemany(sql, list(data_iter))
 
 class DataFetcher:
     def __init__(self, data_source="binance"):
         self.data_source = data_source.lower()
-        self.db_handler = DatabaseHandler() # Initialize DatabaseHandler
+        self.db_handler = get_db() # Shared DatabaseHandler (per-thread sqlite connections)
+        self.cache = FileCache(base_dir='.cache') # TTL cache for immutable historical klines
+        self.rate_limiter = TokenBucket() # Paces requests under Binance's 1200 weight/min budget
+        self._kline_url_cache = {} # (symbol, interval) -> pre-encoded kline URL prefix
+
+        # One persistent session with keep-alive: all fetches go to the same host,
+        # so reusing the TCP+TLS connection avoids a full handshake per request.
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'the-hand/1.0'
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # HTTP/2 client for paginated range fetches: all windows share one
+        # multiplexed connection instead of a round-trip per window.
+        self.aclient = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            headers={'User-Agent': 'the-hand/1.0'},
+        )
 
         if self.data_source == "binance":
-            self.base_url = "https://api.binance.com/api/v3"
+            self.base_url = _BINANCE_BASE_URL
         elif self.data_source == "coinbase":
-            self.base_url = "https://api.coinbase.com/v2"  # Example Coinbase API base URL
+            self.base_url = _COINBASE_BASE_URL  # Example Coinbase API base URL
         # Add more exchanges/APIs as needed
         else:
             raise ValueError(f"Unsupported data source: {data_source}")
 
         logger.info(f"DataFetcher initialized with source: {self.data_source}")
 
+    def _sync_rate_limit(self, response):
+        """Drains local tokens to match the server's reported used weight, if present."""
+        used = response.headers.get('X-MBX-USED-WEIGHT-1M')
+        if used is not None:
+            try:
+                self.rate_limiter.sync_used_weight(int(used))
+            except (TypeError, ValueError):
+                pass  # Unparseable header; keep local accounting.
+
+    def close(self):
+        """Closes the underlying HTTP session and its pooled connections."""
+        self.session.close()
+        try:
+            asyncio.run(self.aclient.aclose())
+        except RuntimeError:
+            pass  # Already inside a running loop; the client is closed with it.
+
     def fetch_historical_data(self, pair, interval, limit=1000):
         """
         Fetches historical candlestick data.
@@ -40,24 +110,61 @@ class DataFetcher:
             logger.error(f"Unsupported data source for historical data: {self.data_source}")
             return None
 
-    def _fetch_historical_data_binance(self, pair, interval, limit):
-        """Fetches historical candlestick data from Binance."""
+    def _fetch_historical_data_binance(self, pair, interval, limit, use_cache=True):
+        """Fetches historical candlestick data from Binance. use_cache=False
+        forces a network fetch (the realtime price path must never be served
+        yesterday's candle from disk)."""
         symbol = pair.replace("/", "").upper()
-        endpoint = "/klines"
-        params = {
-            "symbol": symbol,
-            "interval": interval,
-            "limit": limit
-        }
-        url = self.base_url + endpoint
+        # The symbol/interval part of the URL is static per watchlist entry, so it
+        # is encoded once and reused; only limit varies per call.
+        base = self._kline_url_cache.get((symbol, interval))
+        if base is None:
+            base = self._kline_url_cache.setdefault(
+                (symbol, interval), f"{self.base_url}/klines?symbol={symbol}&interval={interval}")
+        url = f"{base}&limit={limit}"
+
+        # Closed klines are immutable, but the final candle of every payload is
+        # still open on Binance, so hits are only honored for one candle
+        # interval — long enough to absorb repeat calls within a run, short
+        # enough that an open candle can't be served for the full default TTL.
+        cache_key = FileCache.make_key(self.data_source, symbol, interval, limit)
+        cache_subdir = f"{self.data_source}/{symbol}"
+        if use_cache:
+            ttl = min(self._map_interval_to_ms(interval) // 1000, self.cache.default_ttl)
+            cached = self.cache.get(cache_key, subdir=cache_subdir, ttl=ttl)
+            if cached is not None:
+                logger.debug(f"Cache hit for {symbol} {interval} klines (limit={limit}).")
+                return cached
+
         try:
-            response = requests.get(url, params=params)
+            self.rate_limiter.acquire(weight=1)
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+            self._sync_rate_limit(response)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)  # C-accelerated decode; kline payloads are digit-heavy
             # Insert data into database
             if data:
-                data_to_insert = [(symbol, str(candle[0]), float(candle[1]), float(candle[2]), float(candle[3]), float(candle[4]), float(candle[5]), str(candle[6]), float(candle[7]), int(candle[8]), float(candle[9]), float(candle[10])) for candle in data]
-                self.db_handler.insert_data("klines", data_to_insert)
+                # Columnar parse (AoS -> SoA): one np.array conversion of the payload,
+                # then per-column C-level casts — no Python-level pass over the rows.
+                arr = np.array(data, dtype=object)
+                df = pd.DataFrame({
+                    'symbol': symbol,
+                    'open_time': arr[:, 0].astype(np.int64),
+                    'open': arr[:, 1].astype(np.float64),
+                    'high': arr[:, 2].astype(np.float64),
+                    'low': arr[:, 3].astype(np.float64),
+                    'close': arr[:, 4].astype(np.float64),
+                    'volume': arr[:, 5].astype(np.float64),
+                    'close_time': arr[:, 6].astype(np.int64),
+                    'quote_asset_volume': arr[:, 7].astype(np.float64),
+                    'number_of_trades': arr[:, 8].astype(np.int64),
+                    'taker_buy_base_asset_volume': arr[:, 9].astype(np.float64),
+                    'taker_buy_quote_asset_volume': arr[:, 10].astype(np.float64),
+                })
+                df.to_sql("klines", self.db_handler.conn, if_exists='append',
+                          index=False, method=_insert_or_ignore, chunksize=500)
+                if use_cache:
+                    self.cache.put(cache_key, data, subdir=cache_subdir)
             return data
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching data from Binance for {pair}: {e}")
@@ -74,9 +181,9 @@ class DataFetcher:
         }
         url = self.base_url + endpoint
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             # Adapt the parsing and database insertion logic for Coinbase data format
 
@@ -85,46 +192,204 @@ class DataFetcher:
             logger.error(f"Error fetching data from Coinbase for {pair}: {e}")
             return None
 
-    def _map_interval_to_coinbase_granularity(self, interval):
+    async def _fetch_range(self, symbol, interval, start_ms, end_ms):
+        """
+        Fetches all Binance klines in [start_ms, end_ms) by issuing every
+        1000-candle pagination window concurrently over the shared HTTP/2
+        client; N windows cost ~1 round-trip instead of N.
+        Args:
+            symbol (str): Exchange symbol (e.g., "BTCUSDT").
+            interval (str): Candlestick interval (e.g., "1h").
+            start_ms (int): Range start, epoch milliseconds (inclusive).
+            end_ms (int): Range end, epoch milliseconds (exclusive).
+        Returns:
+            list: Concatenated candle lists in time order, or None on error.
+        """
+        url = self.base_url + "/klines"
+        step = self._map_interval_to_ms(interval) * 1000  # 1000 candles per window
+        windows = range(start_ms, end_ms, step)
+        async def _get_window(start):
+            await self.rate_limiter.acquire_async(weight=1)
+            return await self.aclient.get(url, params={
+                "symbol": symbol, "interval": interval, "limit": 1000,
+                "startTime": start, "endTime": min(start + step - 1, end_ms - 1),
+            })
+
+        try:
+            responses = await asyncio.gather(*[_get_window(s) for s in windows])
+            candles = []
+            for response in responses:
+                response.raise_for_status()
+                candles.extend(response.json())
+            return candles
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching kline range from Binance for {symbol}: {e}")
+            return None
+
+    def fetch_historical_range(self, pair, interval, start_ms, end_ms):
+        """
+        Fetches an arbitrary-length kline range, paginating past the 1000-candle
+        per-request limit with concurrent windows (see _fetch_range).
+        Args:
+            pair (str): Trading pair (e.g., "BTC/USDT").
+            interval (str): Candlestick interval (e.g., "1h").
+            start_ms (int): Range start, epoch milliseconds (inclusive).
+            end_ms (int): Range end, epoch milliseconds (exclusive).
+        Returns:
+            list: List of candlestick data or None if error.
+        """
+        if self.data_source != "binance":
+            logger.error(f"Unsupported data source for range fetch: {self.data_source}")
+            return None
+        symbol = pair.replace("/", "").upper()
+        return asyncio.run(self._fetch_range(symbol, interval, start_ms, end_ms))
+
+    @staticmethod
+    def _map_interval_to_ms(interval):
+        """Maps common interval notation (e.g., 1m, 1h, 1d) to milliseconds per candle."""
+        return _COINBASE_GRANULARITY.get(interval, 3600) * 1000
+
+    @staticmethod
+    def _map_interval_to_coinbase_granularity(interval):
         """Maps common interval notation (e.g., 1m, 1h, 1d) to Coinbase's granularity."""
-        mapping = {
-            "1m": 60,
-            "5m": 300,
-            "15m": 900,
-            "1h": 3600,
-            "6h": 21600,
-            "1d": 86400,
-        }
-        return mapping.get(interval, 3600) # Default to 1h if not found
+        return _COINBASE_GRANULARITY.get(interval, 3600) # Default to 1h if not found
 
     def fetch_realtime_data(self, pair):
         """Fetches realtime data (placeholder - can be improved with WebSocket)."""
         logger.info(f"Fetching realtime data for {pair} from {self.data_source} (placeholder)")
         # For now, just fetch the latest Kline (1 minute) as "realtime"
         if self.data_source == "binance":
-            data = self._fetch_historical_data_binance(pair, interval="1m", limit=1)
+            # Cache bypassed: a price poll must reflect the exchange now, not
+            # a disk entry written up to a TTL ago (fetch_realtime_data_async
+            # and fetch_realtime_prices already skip the cache for the same
+            # reason).
+            data = self._fetch_historical_data_binance(pair, interval="1m", limit=1, use_cache=False)
         elif self.data_source == "coinbase":
             data = self._fetch_historical_data_coinbase(pair, interval="1m", limit=1)
         else:
             logger.error(f"Unsupported data source for realtime data: {self.data_source}")
-            return {"status": "error", "message": "Unsupported data source"}
+            return {"status": "error", "price": None, "timestamp": None,
+                    "message": "Unsupported data source"}
 
+        # Uniform return shape: every branch carries status/price/timestamp/message
+        # so callers can read any key without branching on the outcome.
         if data:
             # Extract only the last candlestick's closing price for simplicity as "realtime price"
-            last_candle = data[-1] if data else None
-            if last_candle:
-                if self.data_source == "binance":
-                    realtime_price = float(last_candle[4])
-                    return {"status": "success", "price": realtime_price, "timestamp": last_candle[0]}
-                elif self.data_source == "coinbase":
-                    # Adapt parsing for Coinbase
-                    realtime_price = float(last_candle[4]) # Example assuming close price is at index 4
-                    return {"status": "success", "price": realtime_price, "timestamp": last_candle[0]}
-            else:
-                return {"status": "error", "message": "No realtime data fetched."}
-        else:
+            last_candle = data[-1]
+            # Close price sits at index 4 for both Binance and Coinbase candle formats
+            return {"status": "success", "price": float(last_candle[4]),
+                    "timestamp": last_candle[0], "message": ""}
+        return {"status": "error", "price": None, "timestamp": None,
+                "message": "Error fetching realtime data."}
+
+    def fetch_realtime_prices(self, pairs):
+        """
+        Fetches current prices for several pairs in ONE request via Binance's
+        batched /ticker/price endpoint, instead of a round-trip (and a full
+        kline) per pair.
+        Args:
+            pairs (list): Trading pairs (e.g., ["BTC/USDT", "ETH/USDT"]).
+        Returns:
+            dict: Mapping of exchange symbol (e.g., "BTCUSDT") -> float price;
+                  empty dict on error.
+        """
+        if self.data_source != "binance":
+            logger.error(f"Unsupported data source for batched prices: {self.data_source}")
+            return {}
+        symbols = orjson.dumps([p.replace("/", "").upper() for p in pairs]).decode()
+        try:
+            self.rate_limiter.acquire(weight=2)
+            response = self.session.get(self.base_url + "/ticker/price",
+                                        params={"symbols": symbols}, timeout=REQUEST_TIMEOUT)
+            self._sync_rate_limit(response)
+            response.raise_for_status()
+            return {item['symbol']: float(item['price']) for item in orjson.loads(response.content)}
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching batched prices from Binance: {e}")
+            return {}
+
+    def fetch_historical_data_batch(self, pairs, interval, limit=1000):
+        """
+        Fetches historical data for several pairs concurrently. Binance has no
+        multi-symbol klines endpoint, so the per-pair fetches run in threads
+        under one gather — total latency is ~1 round-trip instead of one per
+        pair, with the token bucket still pacing the aggregate request rate.
+        Args:
+            pairs (list): Trading pairs (e.g., ["BTC/USDT", "ETH/USDT"]).
+            interval (str): Candlestick interval (e.g., "1d").
+            limit (int): Number of data points per pair.
+        Returns:
+            dict: Mapping of pair -> candle list (or None on fetch error).
+        """
+        async def _gather():
+            semaphore = asyncio.Semaphore(15)
+
+            async def _one(pair):
+                async with semaphore:
+                    data = await asyncio.to_thread(self.fetch_historical_data, pair, interval, limit)
+                    return pair, data
+
+            return dict(await asyncio.gather(*[_one(pair) for pair in pairs]))
+
+        return asyncio.run(_gather())
+
+    async def fetch_realtime_data_async(self, pair, session):
+        """
+        Async variant of fetch_realtime_data for concurrent multi-pair polling.
+        Fetches the latest 1m kline without touching the database (it is a price
+        poll, not a historical backfill).
+        Args:
+            pair (str): Trading pair (e.g., "BTC/USDT").
+            session (aiohttp.ClientSession): Shared session for connection reuse.
+        Returns:
+            dict: Same shape as fetch_realtime_data ({'status', 'price', 'timestamp'} or error).
+        """
+        if self.data_source != "binance":
+            # No async parser for this source yet; run the blocking path in a thread.
+            return await asyncio.get_running_loop().run_in_executor(None, self.fetch_realtime_data, pair)
+
+        symbol = pair.replace("/", "").upper()
+        url = self.base_url + "/klines"
+        params = {"symbol": symbol, "interval": "1m", "limit": 1}
+        try:
+            await self.rate_limiter.acquire_async(weight=1)
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=20)) as response:
+                response.raise_for_status()
+                data = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching realtime data from Binance for {pair}: {e}")
             return {"status": "error", "message": "Error fetching realtime data."}
 
+        if data:
+            last_candle = data[-1]
+            return {"status": "success", "price": float(last_candle[4]), "timestamp": last_candle[0]}
+        return {"status": "error", "message": "No realtime data fetched."}
+
+    def fetch_realtime_data_batch(self, pairs, max_concurrent=10):
+        """
+        Fetches realtime data for several pairs concurrently instead of one
+        blocking request per pair; total latency is ~1 round-trip rather than
+        len(pairs). Concurrency is capped well below Binance's 1200 weight/min
+        rate limit.
+        Args:
+            pairs (list): Trading pairs to poll.
+            max_concurrent (int): Maximum in-flight requests.
+        Returns:
+            dict: Mapping of pair -> fetch_realtime_data-style result dict.
+        """
+        async def _run():
+            semaphore = asyncio.Semaphore(max_concurrent)
+
+            async def _guarded(pair):
+                async with semaphore:
+                    return await self.fetch_realtime_data_async(pair, session)
+
+            async with aiohttp.ClientSession(headers={'User-Agent': 'the-hand/1.0'}) as session:
+                results = await asyncio.gather(*[_guarded(pair) for pair in pairs])
+            return dict(zip(pairs, results))
+
+        return asyncio.run(_run())
+
     # Add methods for fetching data from other exchanges/APIs as needed
     # Example: def fetch_data_from_coinbase(self, ...):
 
@@ -135,7 +400,7 @@ if __name__ == '__main__':
     historical_data = fetcher.fetch_historical_data(pair, interval=interval, limit=10)
     if historical_data:
         print(f"Successfully fetched historical data for {pair} ({interval}):")
-        print(json.dumps(historical_data, indent=2))  # Pretty print for readability
+        print(orjson.dumps(historical_data, option=orjson.OPT_INDENT_2).decode())  # Pretty print for readability
     else:
         print(f"Failed to fetch historical data for {pair} ({interval}).")
 
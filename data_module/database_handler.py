@@ -1,26 +1,68 @@
 # data_module/database_handler.py
 import sqlite3
+import threading
 from utils.logger import logger
-import pandas as pd
 
 class DatabaseHandler:
+    # Klines always have this exact shape, so the schema and statement are fixed at
+    # class level instead of being rebuilt per insert. The (symbol, open_time)
+    # primary key plus INSERT OR IGNORE pushes dedup of overlapping fetches to the
+    # DB layer, and integer millisecond timestamps keep rows small and range
+    # queries index-friendly.
+    _KLINES_SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS klines ("
+        "symbol TEXT, open_time INTEGER, open REAL, high REAL, low REAL, close REAL, "
+        "volume REAL, close_time INTEGER, quote_asset_volume REAL, number_of_trades INTEGER, "
+        "taker_buy_base_asset_volume REAL, taker_buy_quote_asset_volume REAL, "
+        "PRIMARY KEY (symbol, open_time)) WITHOUT ROWID"
+    )
+    _KLINES_INSERT_SQL = (
+        "INSERT OR IGNORE INTO klines (symbol, open_time, open, high, low, close, volume, close_time, "
+        "quote_asset_volume, number_of_trades, taker_buy_base_asset_volume, taker_buy_quote_asset_volume) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
     def __init__(self, db_name="crypto_data.db"):
         self.db_name = db_name
-        self.conn = None
+        self._stmt_cache = {}  # (table_name, ncols) -> prepared INSERT statement string
+        # SQLite connections cannot be shared across threads, so each thread
+        # gets its own lazily-opened connection (safe concurrent writers with WAL).
+        self._local = threading.local()
         logger.info("DatabaseHandler initialized.")
 
+    @property
+    def conn(self):
+        """Thread-local connection, opened (with PRAGMAs applied) on first access."""
+        if getattr(self._local, 'conn', None) is None:
+            self.connect()
+        return getattr(self._local, 'conn', None)
+
     def connect(self):
         """Connects to the SQLite database."""
         try:
-            self.conn = sqlite3.connect(self.db_name)
+            # isolation_level=None disables the DBAPI's implicit transactions;
+            # batch paths below draw their own BEGIN IMMEDIATE/COMMIT boundaries
+            # so each batch costs exactly one fsync.
+            self._local.conn = sqlite3.connect(self.db_name, check_same_thread=False,
+                                               isolation_level=None)
+            # Bulk-insert friendly settings: WAL avoids writer/reader blocking,
+            # synchronous=NORMAL drops the per-commit fsync (safe with WAL),
+            # and the larger cache/in-memory temp store keep batches off disk.
+            self._local.conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn.execute("PRAGMA cache_size=-64000")
+            self._local.conn.execute(self._KLINES_SCHEMA)
             logger.info(f"Connected to database: {self.db_name}")
         except sqlite3.Error as e:
             logger.error(f"Error connecting to database: {e}")
 
     def disconnect(self):
-        """Disconnects from the database."""
-        if self.conn:
-            self.conn.close()
+        """Disconnects this thread's connection from the database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn:
+            conn.close()
+            self._local.conn = None
             logger.info(f"Disconnected from database: {self.db_name}")
 
     def create_table(self, table_name, schema):
@@ -30,8 +72,6 @@ class DatabaseHandler:
             table_name (str): Name of the table.
             schema (str): SQL schema definition (e.g., "id INTEGER PRIMARY KEY, price REAL, timestamp TEXT").
         """
-        if not self.conn:
-            self.connect()
         try:
             cursor = self.conn.cursor()
             cursor.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({schema})")
@@ -40,6 +80,45 @@ class DatabaseHandler:
         except sqlite3.Error as e:
             logger.error(f"Error creating table: {e}")
 
+    def _rollback(self):
+        """Rolls back the open transaction, swallowing errors if none is active."""
+        try:
+            self.conn.execute("ROLLBACK")
+        except sqlite3.Error:
+            pass
+
+    def _insert_stmt(self, table_name, ncols):
+        """Returns the cached INSERT statement for a table/arity, building it once."""
+        key = (table_name, ncols)
+        stmt = self._stmt_cache.get(key)
+        if stmt is None:
+            placeholders = ', '.join(['?'] * ncols)
+            stmt = self._stmt_cache.setdefault(key, f"INSERT INTO {table_name} VALUES ({placeholders})")
+        return stmt
+
+    def insert_klines(self, rows, chunk_size=10_000):
+        """
+        Inserts kline rows with the fixed 12-column statement in one transaction.
+        Rows must be (symbol, open_time, open, high, low, close, volume, close_time,
+        quote_asset_volume, number_of_trades, taker_buy_base_asset_volume,
+        taker_buy_quote_asset_volume) tuples.
+        Args:
+            rows (list of tuples): Kline rows in the column order above.
+            chunk_size (int): Rows per executemany batch within the transaction.
+        """
+        if not rows:
+            return
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            for i in range(0, len(rows), chunk_size):
+                cursor.executemany(self._KLINES_INSERT_SQL, rows[i:i + chunk_size])
+            cursor.execute("COMMIT")
+            logger.info(f"Bulk inserted {len(rows)} kline rows.")
+        except sqlite3.Error as e:
+            self._rollback()
+            logger.error(f"Error inserting kline rows: {e}")
+
     def insert_data(self, table_name, data):
         """
         Inserts data into a table.
@@ -48,17 +127,41 @@ class DatabaseHandler:
             data (list of tuples): List of tuples, where each tuple represents a row to be inserted.
                                    The order of values in the tuple should match the column order in the table.
         """
-        if not self.conn:
-            self.connect()
         try:
             cursor = self.conn.cursor()
-            placeholders = ', '.join(['?'] * len(data[0]))  # Create placeholders for values based on data size
-            cursor.executemany(f"INSERT INTO {table_name} VALUES ({placeholders})", data)
-            self.conn.commit()
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.executemany(self._insert_stmt(table_name, len(data[0])), data)
+            cursor.execute("COMMIT")
             logger.info(f"Data inserted into table: {table_name}")
         except sqlite3.Error as e:
+            self._rollback()
             logger.error(f"Error inserting data: {e}")
 
+    def insert_data_bulk(self, table_name, data, chunk_size=10_000):
+        """
+        Inserts many rows inside a single explicit transaction.
+        SQLite fsyncs on every commit, so committing per fetch dominates runtime
+        when many pairs/intervals are inserted; one BEGIN/COMMIT around chunked
+        executemany calls pays that cost once.
+        Args:
+            table_name (str): Name of the table.
+            data (list of tuples): Rows to insert; tuple order must match the column order.
+            chunk_size (int): Rows per executemany batch within the transaction.
+        """
+        if not data:
+            return
+        try:
+            cursor = self.conn.cursor()
+            sql = self._insert_stmt(table_name, len(data[0]))
+            cursor.execute("BEGIN IMMEDIATE")
+            for i in range(0, len(data), chunk_size):
+                cursor.executemany(sql, data[i:i + chunk_size])
+            cursor.execute("COMMIT")
+            logger.info(f"Bulk inserted {len(data)} rows into table: {table_name}")
+        except sqlite3.Error as e:
+            self._rollback()
+            logger.error(f"Error bulk inserting data: {e}")
+
     def fetch_data(self, table_name, condition=None):
         """
         Fetches data from a table.
@@ -69,8 +172,6 @@ class DatabaseHandler:
         Returns:
             list: List of tuples, where each tuple represents a row.
         """
-        if not self.conn:
-            self.connect()
         try:
             cursor = self.conn.cursor()
             if condition:
@@ -93,8 +194,7 @@ class DatabaseHandler:
         Returns:
             pd.DataFrame: DataFrame containing the fetched data.
         """
-        if not self.conn:
-            self.connect()
+        import pandas as pd  # Deferred: pandas is heavy and only this read path needs it
         try:
             if condition:
                 query = f"SELECT * FROM {table_name} WHERE {condition}"
@@ -110,36 +210,18 @@ class DatabaseHandler:
 if __name__ == '__main__':
     db_handler = DatabaseHandler()
 
-    # Example schema
-    klines_schema = """
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        symbol TEXT,
-        open_time TEXT,
-        open REAL,
-        high REAL,
-        low REAL,
-        close REAL,
-        volume REAL,
-        close_time TEXT,
-        quote_asset_volume REAL,
-        number_of_trades INTEGER,
-        taker_buy_base_asset_volume REAL,
-        taker_buy_quote_asset_volume REAL
-    """
-
-    # Create table
-    db_handler.create_table("klines", klines_schema)
-
-    # Example data (replace with your actual fetched data)
+    # The klines table is created automatically on connect (see _KLINES_SCHEMA).
+
+    # Example data (replace with your actual fetched data; timestamps are epoch ms)
     example_data = [
-        ("BTCUSDT", "2023-06-20 00:00:00", 30000.0, 30500.0, 29800.0, 30200.0, 1000.0, "2023-06-20 23:59:59", 30200000.0, 100, 500.0, 15100000.0),
-        ("BTCUSDT", "2023-06-21 00:00:00", 30200.0, 30700.0, 30100.0, 30600.0, 1200.0, "2023-06-21 23:59:59", 36720000.0, 120, 600.0, 18360000.0),
-        ("ETHUSDT", "2023-06-20 00:00:00", 1800.0, 1830.0, 1790.0, 1820.0, 5000.0, "2023-06-20 23:59:59", 9100000.0, 50, 2500.0, 4550000.0),
-        ("ETHUSDT", "2023-06-21 00:00:00", 1820.0, 1850.0, 1810.0, 1840.0, 6000.0, "2023-06-21 23:59:59", 11040000.0, 60, 3000.0, 5520000.0),
+        ("BTCUSDT", 1687219200000, 30000.0, 30500.0, 29800.0, 30200.0, 1000.0, 1687305599999, 30200000.0, 100, 500.0, 15100000.0),
+        ("BTCUSDT", 1687305600000, 30200.0, 30700.0, 30100.0, 30600.0, 1200.0, 1687391999999, 36720000.0, 120, 600.0, 18360000.0),
+        ("ETHUSDT", 1687219200000, 1800.0, 1830.0, 1790.0, 1820.0, 5000.0, 1687305599999, 9100000.0, 50, 2500.0, 4550000.0),
+        ("ETHUSDT", 1687305600000, 1820.0, 1850.0, 1810.0, 1840.0, 6000.0, 1687391999999, 11040000.0, 60, 3000.0, 5520000.0),
     ]
 
-    # Insert data
-    db_handler.insert_data("klines", example_data)
+    # Insert data (duplicates on (symbol, open_time) are ignored by the DB)
+    db_handler.insert_klines(example_data)
 
     # Fetch data
     fetched_data = db_handler.fetch_data("klines", condition="symbol='BTCUSDT'")
@@ -152,4 +234,17 @@ if __name__ == '__main__':
     print("\nFetched Data as DataFrame:")
     print(fetched_df)
 
-    db_handler.disconnect()
\ No newline at end of file
+    db_handler.disconnect()
+
+# Shared handler: one DatabaseHandler per process, with per-thread connections
+# underneath. Callers use get_db() instead of constructing their own instance.
+_shared_handler = None
+_shared_handler_lock = threading.Lock()
+
+def get_db(db_name="crypto_data.db"):
+    """Returns the process-wide shared DatabaseHandler, creating it on first use."""
+    global _shared_handler
+    with _shared_handler_lock:
+        if _shared_handler is None:
+            _shared_handler = DatabaseHandler(db_name)
+        return _shared_handler
@@ -0,0 +1,96 @@
+# data_module/realtime_stream.py
+import asyncio
+import threading
+import aiohttp
+import orjson
+from utils.logger import logger
+
+BINANCE_WS_URL = "wss://stream.binance.com:9443/ws"
+RECONNECT_DELAY_SECONDS = 5
+
+class RealtimeStream:
+    """
+    Push-based realtime prices over Binance's WebSocket miniTicker streams.
+    The exchange pushes updates on change, so bandwidth and CPU scale with the
+    update rate instead of a poll rate, and reads are in-memory dict lookups.
+    Runs its own event loop in a background thread; consumers read get_price()
+    (or the prices dict) from any thread.
+    """
+
+    def __init__(self, symbols):
+        self.symbols = [s.replace("/", "").upper() for s in symbols]
+        self.prices = {}  # exchange symbol -> latest close price
+        self._thread = None
+        self._loop = None
+        self._task = None
+
+    def start(self):
+        """Starts the background stream thread (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._thread_main, daemon=True, name="realtime-stream")
+        self._thread.start()
+        logger.info(f"RealtimeStream started for symbols: {self.symbols}")
+
+    def stop(self):
+        """Stops the stream and waits for the background thread to exit."""
+        if self._loop and self._task:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread:
+            self._thread.join(timeout=10)
+        logger.info("RealtimeStream stopped.")
+
+    def get_price(self, symbol):
+        """
+        Returns the latest streamed price for a symbol, or None if no update
+        has arrived yet.
+        Args:
+            symbol (str): Trading pair or exchange symbol (e.g., "BTC/USDT" or "BTCUSDT").
+        """
+        return self.prices.get(symbol.replace("/", "").upper())
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._task = self._loop.create_task(self._run())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    async def _run(self):
+        """Connects, subscribes, and feeds the price dict; reconnects on errors."""
+        subscribe_msg = {
+            "method": "SUBSCRIBE",
+            "params": [f"{s.lower()}@miniTicker" for s in self.symbols],
+            "id": 1,
+        }
+        while True:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(BINANCE_WS_URL) as ws:
+                        await ws.send_json(subscribe_msg)
+                        async for msg in ws:
+                            if msg.type != aiohttp.WSMsgType.TEXT:
+                                continue
+                            payload = orjson.loads(msg.data)
+                            symbol = payload.get('s')
+                            close = payload.get('c')
+                            if symbol and close:
+                                self.prices[symbol] = float(close)
+            except asyncio.CancelledError:
+                raise
+            except (aiohttp.ClientError, OSError) as e:
+                logger.error(f"Realtime stream error, reconnecting in {RECONNECT_DELAY_SECONDS}s: {e}")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+if __name__ == '__main__':
+    import time
+    stream = RealtimeStream(["BTC/USDT", "ETH/USDT"])
+    stream.start()
+    time.sleep(10)  # Let a few updates arrive
+    print("BTCUSDT:", stream.get_price("BTC/USDT"))
+    print("ETHUSDT:", stream.get_price("ETH/USDT"))
+    stream.stop()
@@ -1,10 +1,13 @@
 # main.py
 # Add project root to Python path
+import datetime
+import logging
 import os
 import sys
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 import config
+from concurrent.futures import ThreadPoolExecutor
 from utils.logger import logger
 from data_module.data_fetcher import DataFetcher
 from data_module.data_cleaner import DataCleaner
@@ -12,15 +15,15 @@ from regime_info.technical_analyzer import TechnicalAnalyzer
 from regime_info.regime_classifier import RegimeClassifier
 from regime_info.macro_analyzer import MacroAnalyzer
 from strategist.execution_coordinator import ExecutionCoordinator
-from backtester.backtest_engine import BacktestEngine
-from backtester.report_generator import ReportGenerator
+from backtester.runner import run_backtest, _load_strategy_class
 from trader.risk_manager import RiskManager
+import numpy as np
 import pandas as pd
 import importlib
 import re
 
 class Strategist:
-    def __init__(self, mode, asset_pairs, risk_tolerance, data_fetcher, data_cleaner, technical_analyzer, regime_classifier, execution_coordinator, risk_manager):
+    def __init__(self, mode, asset_pairs, risk_tolerance, data_fetcher, data_cleaner, technical_analyzer, regime_classifier, macro_analyzer, execution_coordinator, risk_manager, realtime_stream=None):
         self.mode = mode
         self.asset_pairs = asset_pairs
         self.risk_tolerance = risk_tolerance
@@ -28,148 +31,165 @@ class Strategist:
         self.data_cleaner = data_cleaner
         self.technical_analyzer = technical_analyzer
         self.regime_classifier = regime_classifier
+        self.macro_analyzer = macro_analyzer
         self.execution_coordinator = execution_coordinator
         self.risk_manager = risk_manager
+        self.realtime_stream = realtime_stream  # Optional push-based price feed (see data_module.realtime_stream)
+        # The pair -> exchange-symbol mapping is invariant for the life of the
+        # strategist, so compute it once instead of re-splitting strings per run.
+        self._pair_symbols = {pair: pair.replace("/", "") for pair in asset_pairs}
+        self._min_bars = max(50, 200)  # longest SMA window the feature vector needs
+        # Dispatch table for per-regime trading logic: new regimes plug in here
+        # without growing an if/elif chain in run().
+        self._regime_handlers = {
+            'bull': self._handle_bull,
+            'bear': self._handle_bear,
+            'sideways': self._handle_sideways,
+        }
         self.current_prices = {}  # Initialize dictionary to store current prices
-        logger.info(f"Strategist initialized in {self.mode} mode for pairs: {self.asset_pairs} with risk tolerance: {self.risk_tolerance}")
+        logger.info("Strategist initialized in %s mode for pairs: %s with risk tolerance: %s",
+                    self.mode, self.asset_pairs, self.risk_tolerance)
 
     def run(self):
         logger.info("Strategist running...")
-        for pair in self.asset_pairs:
-            raw_historical_data = self.data_fetcher.fetch_historical_data(pair, interval="1d", limit=300)
-            if raw_historical_data:
-                cleaned_data = self.data_cleaner.clean_historical_data(raw_historical_data)
-                if cleaned_data:
-                    df = pd.DataFrame(cleaned_data)
-                    close_prices = df['close']
+        historical_by_pair = self.data_fetcher.fetch_historical_data_batch(self.asset_pairs, "1d", limit=300)
+        # Prefer the push-based WebSocket feed when one is attached; otherwise a
+        # single batched ticker request covers every pair instead of a round-trip
+        # (and an over-fetched kline) per pair inside the loop.
+        if self.realtime_stream is not None and self.realtime_stream.prices:
+            realtime_prices = dict(self.realtime_stream.prices)
+        else:
+            realtime_prices = self.data_fetcher.fetch_realtime_prices(self.asset_pairs)
 
-                    # Example: Classify regime (using ML model now)
-                    # This part has been updated, so first prepare the features
-                    sma_50 = self.technical_analyzer.calculate_sma(close_prices, window=50)
-                    sma_200 = self.technical_analyzer.calculate_sma(close_prices, window=200)
-                    # Add CPI data. fetch CPI data for last 30 days.
-                    end_date_cpi = pd.Timestamp.today().strftime('%Y-%m-%d')
-                    start_date_cpi = pd.Timestamp.today() - pd.Timedelta(days=30)
-                    start_date_cpi = start_date_cpi.strftime('%Y-%m-%d')
-                    macro_analyzer = MacroAnalyzer()
-                    cpi_data = macro_analyzer.fetch_cpi(start_date=start_date_cpi, end_date=end_date_cpi) # The cpi should be time series data. Get latest data.
-                    cpi_values = [item['cpi'] for item in cpi_data['data']] if cpi_data and cpi_data['status'] == 'success' else [0]
-                    cpi_val = cpi_values[-1] if cpi_values else 0 # Get the latest value.
-                    features = pd.DataFrame({'SMA50': [sma_50.iloc[-1]], 'SMA200': [sma_200.iloc[-1]], 'CPI': [cpi_val]})  # Create features DataFrame for model
+        # CPI doesn't depend on the pair: fetch the last 30 days once and reuse
+        # the latest value for every pair's feature vector. Plain datetime.date
+        # is cheaper than pd.Timestamp for simple date arithmetic.
+        today = datetime.date.today()
+        end_date_cpi = today.isoformat()
+        start_date_cpi = (today - datetime.timedelta(days=30)).isoformat()
+        cpi_data = self.macro_analyzer.fetch_cpi(start_date=start_date_cpi, end_date=end_date_cpi)
+        # Only the latest point matters, so index it directly instead of
+        # building a throwaway list of the whole series.
+        cpi_val = cpi_data['data'][-1]['cpi'] if cpi_data and cpi_data['status'] == 'success' and cpi_data['data'] else 0
 
-                    regime = self.regime_classifier.predict(features)[0] if self.regime_classifier.model else self.regime_classifier.classify_regime_sma_crossover(close_prices) # If model is None fallback to SMA crossover
+        # Analysis is independent per pair (clean -> indicators -> classify),
+        # so fan it out over a thread pool; trading below stays sequential in
+        # pair order because it reads and mutates shared portfolio state.
+        with ThreadPoolExecutor(max_workers=min(16, max(1, len(self.asset_pairs)))) as executor:
+            futures = {pair: executor.submit(self._analyze_pair, pair, historical_by_pair[pair], cpi_val)
+                       for pair in self._pair_symbols}
+        regimes = {pair: future.result() for pair, future in futures.items()}
 
-                    logger.info(f"Market regime for {pair}: {regime}")
+        for pair, symbol in self._pair_symbols.items():
+            regime = regimes[pair]
+            if regime is None:
+                continue  # _analyze_pair already logged why
 
-                    # --- Example Strategy Logic (Simplified for Phase 3) ---
-                    # In a bull regime, buy; in sideways, do nothing; in bear, sell (if holding)
-                    current_price_data = self.data_fetcher.fetch_realtime_data(pair)
-                    if current_price_data['status'] == 'success':
-                        current_price = current_price_data['price']
-                        symbol = pair.replace("/", "")
-                        self.current_prices[symbol] = current_price  # Update current_prices dictionary
+            # --- Example Strategy Logic (Simplified for Phase 3) ---
+            # In a bull regime, buy; in sideways, do nothing; in bear, sell (if holding)
+            current_price = realtime_prices.get(symbol.upper())
+            if current_price is not None:
+                self.current_prices[symbol] = current_price  # Update current_prices dictionary
 
-                        # --- RISK Management Check ---
-                        portfolio_value = self.execution_coordinator.get_portfolio_status(current_prices_usd=self.current_prices)['portfolio_value_usd']
-                        order_params = {'order_type': 'buy', 'symbol': symbol, 'amount': 0.01, 'price': current_price} # Example amount
-                        if regime == 'bull':
-                             if not self.risk_manager.check_trade_limits(order_params, portfolio_value):
-                                 logger.warning(f"Trade limits exceeded for {pair}, skipping trading logic.")
-                                 continue # Skip this trade if limits are exceeded
-                             else:
-                                 execution_result = self.execution_coordinator.execute_trade(order_params)
-                                 logger.info(f"Buy order placed for {pair} in bull regime. Result: {execution_result}")
-                        elif regime == 'bear':
-                            positions = self.execution_coordinator.get_portfolio_status()['positions']
-                            if symbol in positions and positions[symbol]['amount'] > 0:
-                                order_params = {'order_type': 'sell', 'symbol': symbol, 'amount': positions[symbol]['amount'], 'price': current_price}
-                                if not self.risk_manager.check_trade_limits(order_params, portfolio_value):
-                                    logger.warning(f"Trade limits exceeded for {pair}, skipping trading logic.")
-                                    continue # Skip this trade if limits are exceeded
-                                else:
-                                    execution_result = self.execution_coordinator.execute_trade(order_params)
-                                    logger.info(f"Sell order placed for {pair} in bear regime. Result: {execution_result}")
-                            else:
-                                logger.info(f"Bear regime for {pair}, but no position to sell.")
-                        elif regime == 'sideways':
-                            logger.info(f"Sideways regime for {pair}, no action taken.")
-                        # --- End of Example Strategy Logic ---
-                        # Log portfolio status after each pair's processing, including all current prices
+                # --- RISK Management Check ---
+                # One status snapshot serves the risk check, the bear-branch
+                # position lookup, and (if no trade happens) the final log.
+                portfolio_status = self.execution_coordinator.get_portfolio_status(current_prices_usd=self.current_prices)
+                handler = self._regime_handlers.get(regime)
+                execution_result = handler(pair, symbol, current_price, portfolio_status) if handler else None
+                if execution_result is False:
+                    continue # Trade limits exceeded; the handler already warned
+                # --- End of Example Strategy Logic ---
+                # Log portfolio status after each pair's processing, including all
+                # current prices. The post-trade snapshot exists only for this log
+                # line, so skip both the re-fetch and the (position-iterating) repr
+                # when INFO is filtered out.
+                if logger.isEnabledFor(logging.INFO):
+                    if execution_result is not None and execution_result.get('status') == 'success':
                         portfolio_status = self.execution_coordinator.get_portfolio_status(current_prices_usd=self.current_prices)
-                        logger.info(f"Portfolio Status after processing {pair}: {portfolio_status}")
-
-                    else:
-                        logger.warning(f"Could not fetch realtime price for {pair}, skipping trading logic.")
+                    logger.info("Portfolio Status after processing %s: %s", pair, portfolio_status)
 
-
-                else:
-                    logger.warning(f"No cleaned data for {pair}, skipping analysis and trading.")
             else:
-                logger.error(f"Failed to fetch historical data for {pair}.")
+                logger.warning("Could not fetch realtime price for %s, skipping trading logic.", pair)
         logger.info("Strategist finished execution.")
 
+    def _analyze_pair(self, pair, raw_historical_data, cpi_val):
+        """
+        Per-pair analysis: clean -> indicators -> regime. Touches no shared
+        mutable state, so Strategist.run can execute it on worker threads.
+        Args:
+            pair (str): Asset pair (e.g., 'BTC/USDT').
+            raw_historical_data (list): Raw candlestick data for the pair.
+            cpi_val (float): Latest CPI value shared across all pairs.
+        Returns:
+            str: Predicted regime label, or None when the pair must be skipped.
+        """
+        if not raw_historical_data:
+            logger.error("Failed to fetch historical data for %s.", pair)
+            return None
+        # Columnar cleaning: this path only consumes price arrays, so no
+        # DataFrame is built here at all (the backtester still gets one
+        # from clean_historical_data where the engine needs an index).
+        cleaned_data = self.data_cleaner.clean_historical_columns(raw_historical_data)
+        if not cleaned_data:
+            logger.warning("No cleaned data for %s, skipping analysis and trading.", pair)
+            return None
+        # One contiguous float64 array feeds every downstream indicator,
+        # avoiding repeated Series dispatch in the analyzers.
+        close_arr = cleaned_data['close']
 
-def run_backtest(strategy_name, regime, test_mode=False):
-    """
-    Runs backtest for a given strategy.
-    Args:
-        strategy_name (str): Name of the strategy file (e.g., 'ema_crossover').
-        regime (str): Regime folder where strategy is located (e.g., 'bull').
-        test_mode (bool): If True, loads from to_test folder instead of approved.
-    """
-    logger.info(f"Starting backtest run for strategy: {strategy_name} in regime: {regime}")
+        # Too little history means a NaN SMA-200 feature and a garbage
+        # prediction — skip all downstream work for this pair instead.
+        if close_arr.shape[0] < self._min_bars:
+            logger.warning("Only %d bars of history for %s (need %d); skipping analysis and trading.",
+                           close_arr.shape[0], pair, self._min_bars)
+            return None
 
-    # 1. Load Strategy dynamically
-    try:
-        folder = 'to_test' if test_mode else 'approved'
-        strategy_module = importlib.import_module(f'strategy.{folder}.{regime}.{strategy_name}')
-        strategy_class = getattr(strategy_module, "Strategy")
-        
-        # Validate strategy
-        from strategy.strategy_validator import StrategyValidator
-        is_valid, msg = StrategyValidator.validate_strategy(strategy_class)
-        if not is_valid:
-            logger.error(f"Strategy validation failed: {msg}")
-            return
-            
-        strategy = strategy_class(name=strategy_name, symbol="BTCUSDT")
-        logger.info(f"Successfully loaded strategy: {strategy_name} from strategy/{folder}/{regime}/{strategy_name}.py")
+        # Example: Classify regime (using ML model now)
+        # Only the latest indicator levels feed the model, so skip the
+        # full rolling series and compute just the last window.
+        sma_50_last = self.technical_analyzer.calculate_sma_last(close_arr, window=50)
+        sma_200_last = self.technical_analyzer.calculate_sma_last(close_arr, window=200)
+        # Plain (1, 3) ndarray: building a one-row DataFrame per pair costs
+        # more than the model's predict call itself.
+        features = np.array([[sma_50_last, sma_200_last, cpi_val]], dtype=np.float64)
 
-    except (ImportError, AttributeError) as e:
-        logger.error(f"Error loading strategy {strategy_name} from strategy/{folder}/{regime}: {e}")
-        return
+        regime = self.regime_classifier.predict(features)[0] if self.regime_classifier.model else self.regime_classifier.classify_regime_sma_crossover(close_arr) # If model is None fallback to SMA crossover
 
-    # 2. Fetch historical data (for BTCUSDT, adjust as needed)
-    fetcher = DataFetcher()
-    cleaner = DataCleaner()
-    pair = "BTC/USDT"  # Example pair, could be parameterized
-    interval = "1d"  # Example interval, could be parameterized
-    raw_historical_data = fetcher.fetch_historical_data(pair, interval=interval, limit=500)  # Get enough data for backtest
-    if not raw_historical_data:
-        logger.error(f"Failed to fetch historical data for {pair}. Backtest aborted.")
-        return
-    cleaned_data = cleaner.clean_historical_data(raw_historical_data)
-    historical_df = pd.DataFrame(cleaned_data).set_index('close_timestamp')
+        # %-style args defer string formatting until the logger
+        # decides the record is actually emitted.
+        logger.info("Market regime for %s: %s", pair, regime)
+        return regime
 
-    # 3. Initialize Backtest Engine and Report Generator
-    backtest_engine = BacktestEngine()
-    report_generator = ReportGenerator()
+    # --- Per-regime trading handlers (dispatched via self._regime_handlers) ---
+    # Each returns the execute_trade result dict, None when no trade was made,
+    # or False when trade limits blocked the pair entirely.
 
-    # 4. Run Backtest
-    backtest_results = backtest_engine.run_backtest(strategy, historical_df, initial_balance_usd=10000)
+    def _handle_bull(self, pair, symbol, current_price, portfolio_status):
+        order_params = {'order_type': 'buy', 'symbol': symbol, 'amount': 0.01, 'price': current_price} # Example amount
+        if not self.risk_manager.check_trade_limits(order_params, portfolio_status['portfolio_value_usd']):
+            logger.warning("Trade limits exceeded for %s, skipping trading logic.", pair)
+            return False
+        execution_result = self.execution_coordinator.execute_trade(order_params)
+        logger.info("Buy order placed for %s in bull regime. Result: %s", pair, execution_result)
+        return execution_result
 
-    # 5. Generate and Save Report
-    if backtest_results['status'] == 'completed':
-        report_text = report_generator.generate_report(backtest_results)
-        print(report_text)  # Print to console
-        report_filepath = report_generator.save_report_to_file(report_text)
-        if report_filepath:
-            logger.info(f"Backtest report saved to: {report_filepath}")
-        else:
-            logger.error("Failed to save backtest report to file.")
-    else:
-        logger.error("Backtest run failed. No report generated.")
-        print("Backtest Failed. Check logs for details.")
+    def _handle_bear(self, pair, symbol, current_price, portfolio_status):
+        positions = portfolio_status['positions']
+        if symbol in positions and positions[symbol]['amount'] > 0:
+            order_params = {'order_type': 'sell', 'symbol': symbol, 'amount': positions[symbol]['amount'], 'price': current_price}
+            if not self.risk_manager.check_trade_limits(order_params, portfolio_status['portfolio_value_usd']):
+                logger.warning("Trade limits exceeded for %s, skipping trading logic.", pair)
+                return False
+            execution_result = self.execution_coordinator.execute_trade(order_params)
+            logger.info("Sell order placed for %s in bear regime. Result: %s", pair, execution_result)
+            return execution_result
+        logger.info("Bear regime for %s, but no position to sell.", pair)
+        return None
+
+    def _handle_sideways(self, pair, symbol, current_price, portfolio_status):
+        logger.info("Sideways regime for %s, no action taken.", pair)
+        return None
 
 
 if __name__ == "__main__":
@@ -193,6 +213,7 @@ if __name__ == "__main__":
             data_cleaner=data_cleaner,
             technical_analyzer=technical_analyzer,
             regime_classifier=regime_classifier,
+            macro_analyzer=macro_analyzer,
             execution_coordinator=execution_coordinator,
             risk_manager = risk_manager
         )
@@ -211,18 +232,32 @@ if __name__ == "__main__":
             # filter only folders
             regimes_paths = [r for r in regimes_paths if os.path.isdir(os.path.join(to_test_path, r))]
 
-            # Test all strategies in to_test folder
+            # Test all strategies in to_test folder. Import everything up front in
+            # one pass (warm finder caches), then run the backtests off the
+            # preloaded classes.
             logger.info("Testing all strategies in to_test folder")
+            importlib.invalidate_caches()  # Pick up strategy files dropped in since startup
+            preloaded = {}
+            for regime_folder in regimes_paths:
+                strategy_dir = f"{to_test_path}/{regime_folder}"
+                # scandir avoids a stat per entry and sorting keeps runs deterministic
+                strategies = sorted(entry.name[:-3] for entry in os.scandir(strategy_dir)
+                                    if entry.name.endswith('.py') and not entry.name.startswith('_'))
+                for strategy in strategies:
+                    try:
+                        preloaded[(regime_folder, strategy)] = _load_strategy_class('to_test', regime_folder, strategy)
+                    except (ImportError, AttributeError) as e:
+                        logger.error(f"Error preloading strategy {strategy} in {regime_folder}: {e}")
+
             for regime_folder in regimes_paths:
                 try:
-                    # Get list of strategy files
                     strategy_dir = f"{to_test_path}/{regime_folder}"
-                    strategies = [f[:-3] for f in os.listdir(strategy_dir)
-                                if f.endswith('.py') and not f.startswith('_')]
-                    
+                    strategies = [name for (r, name) in preloaded if r == regime_folder]
+
                     for strategy in strategies:
                         logger.info(f"Testing strategy: {strategy} in regime: {regime_folder}")
-                        backtest_results = run_backtest(strategy, regime_folder, test_mode=True)
+                        backtest_results = run_backtest(strategy, regime_folder, test_mode=True,
+                                                        strategy_class=preloaded[(regime_folder, strategy)])
                         if backtest_results and backtest_results['status'] == 'completed':
                             if backtest_results['total_pnl_usd'] > 0:
                                 # Move to approved
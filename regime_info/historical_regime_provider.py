@@ -1,6 +1,9 @@
 import datetime
 from typing import List, Dict
 
+import numpy as np
+import pandas as pd
+
 from data_module.data_fetcher import DataFetcher
 from regime_info.technical_analyzer import TechnicalAnalyzer
 from regime_info.macro_analyzer import MacroAnalyzer
@@ -35,37 +38,65 @@ class HistoricalRegimeProvider:
                 "price": float,
                 "regime_label": str
             }
-        """
-        # 1. Fetch historical market data
-        historical_data = self.data_fetcher.fetch_historical_data(
-            symbol=symbol,
-            start_date=start_date,
-            end_date=end_date,
-            interval=interval
-        )
-
-        # 2. Prepare results
-        labeled_data = []
 
-        # 3. For each data point, run analysis
-        for data_point in historical_data:
-            # For simplicity, we assume data_point includes keys: ["timestamp", "open", "high", "low", "close", "volume"]
-            timestamp = data_point["timestamp"]
-            close_price = data_point["close"]
-
-            # Run technical analysis
-            tech_signals = self.technical_analyzer.analyze_prices([close_price])
+        Labeling is fully vectorized: the SMAs are computed once over the whole
+        close column and every row is labeled in a single np.select pass,
+        instead of re-running the analyzers once per candle. Macro data is
+        fetched once for the whole range and forward-filled onto the candle
+        timestamps (one HTTP round-trip instead of one per candle); each
+        record carries the aligned value under "cpi".
+        """
+        # 1. Fetch historical market data for the date range. The range fetch
+        # paginates past the per-request candle limit and returns raw kline
+        # rows (open_time ms at index 0, close at index 4).
+        start_ms = int(pd.Timestamp(start_date).timestamp() * 1000)
+        end_ms = int(pd.Timestamp(end_date).timestamp() * 1000)
+        candles = self.data_fetcher.fetch_historical_range(symbol, interval, start_ms, end_ms)
+        if not candles:
+            return []
 
-            # Optionally run macro analysis (skipping details for now)
-            macro_signals = self.macro_analyzer.get_macro_signals(timestamp)
+        # 2. One DataFrame for the whole range; the analyzers run once per
+        # indicator rather than once per row.
+        arr = np.array(candles, dtype=object)
+        df = pd.DataFrame({
+            # as_unit("ns"): keep the default pandas resolution so downstream
+            # merges against ordinary DatetimeIndexes don't hit pandas 2.x's
+            # mixed-resolution merge-key errors.
+            "timestamp": pd.to_datetime(arr[:, 0].astype(np.int64), unit="ms").as_unit("ns"),
+            "close": arr[:, 4].astype(np.float64),
+        })
+        close = df["close"]
+        sma_50 = self.technical_analyzer.calculate_sma(close, window=50)
+        sma_200 = self.technical_analyzer.calculate_sma(close, window=200)
 
-            # Combine signals in the regime classifier
-            regime_label = self.regime_classifier.classify_regime(tech_signals, macro_signals)
+        # 3. Label all rows at once: SMA-50/200 trend direction, with the
+        # close-vs-SMA-50 term as an extra price confirmation (stricter than
+        # the classifier's bare-crossover fallback, which has no such term).
+        conditions = [
+            (sma_50 > sma_200) & (close > sma_50),
+            (sma_50 < sma_200) & (close < sma_50),
+        ]
+        df["regime_label"] = np.select(conditions, ["bull", "bear"], default="sideways")
 
-            labeled_data.append({
-                "timestamp": timestamp,
-                "price": close_price,
-                "regime_label": regime_label
-            })
+        # 4. Macro signals: one CPI fetch covers the whole range, forward-filled
+        # onto candle timestamps since CPI is published far less often than
+        # candles close.
+        timestamps = df["timestamp"]
+        cpi_data = self.macro_analyzer.fetch_cpi(
+            start_date=timestamps.iloc[0].strftime("%Y-%m-%d"),
+            end_date=timestamps.iloc[-1].strftime("%Y-%m-%d"),
+        )
+        if cpi_data and cpi_data["status"] == "success" and cpi_data["data"]:
+            cpi_series = pd.Series(
+                [item["cpi"] for item in cpi_data["data"]],
+                index=pd.to_datetime([item["date"] for item in cpi_data["data"]]),
+            ).sort_index()
+            df["cpi"] = cpi_series.reindex(timestamps.dt.floor("D"), method="ffill").to_numpy()
+        else:
+            df["cpi"] = np.nan
 
-        return labeled_data
\ No newline at end of file
+        return (
+            df[["timestamp", "close", "regime_label", "cpi"]]
+            .rename(columns={"close": "price"})
+            .to_dict("records")
+        )
@@ -1,19 +1,81 @@
 # regime_info/macro_analyzer.py
+import asyncio
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from utils.logger import logger
-import json
+import orjson
 import config
 import pandas as pd
 
+# (connect, read) timeouts; connect slightly above a multiple of 3 per requests docs
+REQUEST_TIMEOUT = (3.05, 15)
+
 class MacroAnalyzer:
     def __init__(self):
         self.api_key = config.MACRO_API_KEY  # Add MACRO_API_KEY to your .env and config.py
         self.base_url = "https://api.example-macro-data-provider.com" # Replace with actual API base URL
+        # Persistent session: keep-alive to the provider means only the first
+        # call per process pays the TCP + TLS handshake.
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'the-hand/1.0',
+            'Authorization': f"Bearer {self.api_key}",
+        })
+        # Pool plus transparent retries on transient provider errors, matching
+        # the adapter DataFetcher mounts for the exchange API.
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.2,
+                              status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Async client for fanning out indicator fetches (e.g. several
+        # countries) over one keep-alive HTTP/2 pool.
+        self.aclient = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            headers={
+                'User-Agent': 'the-hand/1.0',
+                'Authorization': f"Bearer {self.api_key}",
+            },
+        )
+        # Memoized successful CPI payloads keyed on (country, start_date,
+        # end_date). Error results are deliberately never stored: a transient
+        # network blip must not disable CPI for the life of the process, so
+        # failures retry on the next call. (A plain per-instance dict also
+        # avoids lru_cache's bound-method pitfall of keying on — and
+        # pinning — self.)
+        self._cpi_cache = {}
         logger.info("MacroAnalyzer initialized.")
 
+    def close(self):
+        """Releases pooled HTTP connections."""
+        self.session.close()
+        try:
+            asyncio.run(self.aclient.aclose())
+        except RuntimeError:
+            # Already inside a running loop; the caller should await aclose().
+            pass
+
+    @staticmethod
+    def _parse_cpi_payload(data):
+        """Maps the provider's CPI payload onto the repo-wide result shape."""
+        if data['status'] == 'success':
+            cpi_data = [{'date': item['date'], 'cpi': item['value']} for item in data['data']] # Example parsing
+            return {'status': 'success', 'data': cpi_data}
+        return {'status': 'error', 'message': data.get('message', 'Unknown API error')}
+
     def fetch_cpi(self, country="US", start_date="2023-01-01", end_date=None):
         """
         Fetches CPI (Consumer Price Index) data from a macroeconomic data provider's API.
+        Successful results are memoized per (country, start_date, end_date): the date
+        window is stable within a run, so repeated calls hit memory instead of HTTP.
+        Error results are never memoized — a failed fetch retries on the next call.
+        Callers must treat the returned dict as read-only.
         Args:
             country (str): Country code (e.g., "US", "UK", "EU").
             start_date (str): Start date for the data (YYYY-MM-DD).
@@ -26,30 +88,72 @@ class MacroAnalyzer:
         if not end_date:
             end_date = pd.Timestamp.today().strftime('%Y-%m-%d') # Today's date if not provided
 
+        cache_key = (country, start_date, end_date)
+        cached = self._cpi_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._fetch_cpi_uncached(country, start_date, end_date)
+        if result.get('status') == 'success':
+            self._cpi_cache[cache_key] = result
+        return result
+
+    def _fetch_cpi_uncached(self, country, start_date, end_date):
+        """One CPI HTTP round-trip, no memoization; see fetch_cpi."""
         endpoint = f"/cpi/{country}"
         url = self.base_url + endpoint
-        headers = {"Authorization": f"Bearer {self.api_key}"}
         params = {"start_date": start_date, "end_date": end_date}
 
         try:
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-            data = response.json()
-
-            # Adapt the parsing logic based on the actual API response format
-            if data['status'] == 'success':
-                cpi_data = [{'date': item['date'], 'cpi': item['value']} for item in data['data']] # Example parsing
-                return {'status': 'success', 'data': cpi_data}
-            else:
-                return {'status': 'error', 'message': data.get('message', 'Unknown API error')}
+            return self._parse_cpi_payload(orjson.loads(response.content))
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching CPI data from API: {e}")
             return {'status': 'error', 'message': str(e)}
-        except (KeyError, json.JSONDecodeError) as e:
+        except (KeyError, orjson.JSONDecodeError) as e:
             logger.error(f"Error parsing CPI data: {e}")
             return {'status': 'error', 'message': 'Error parsing API response'}
 
+    async def fetch_cpi_async(self, country="US", start_date="2023-01-01", end_date=None):
+        """
+        Async variant of fetch_cpi over the shared HTTP/2 client, for callers
+        that fetch several indicators or countries concurrently. Same return
+        shape as fetch_cpi; not memoized.
+        """
+        if not end_date:
+            end_date = pd.Timestamp.today().strftime('%Y-%m-%d')
+
+        url = self.base_url + f"/cpi/{country}"
+        params = {"start_date": start_date, "end_date": end_date}
+
+        try:
+            response = await self.aclient.get(url, params=params)
+            response.raise_for_status()
+            return self._parse_cpi_payload(orjson.loads(response.content))
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching CPI data from API: {e}")
+            return {'status': 'error', 'message': str(e)}
+        except (KeyError, orjson.JSONDecodeError) as e:
+            logger.error(f"Error parsing CPI data: {e}")
+            return {'status': 'error', 'message': 'Error parsing API response'}
+
+    async def fetch_many_async(self, countries, start_date, end_date=None):
+        """
+        Fetches CPI for several countries concurrently over one connection pool.
+        Args:
+            countries (list): Country codes to fetch.
+            start_date (str): Start date for the data (YYYY-MM-DD).
+            end_date (str, optional): End date; defaults to today like fetch_cpi.
+        Returns:
+            dict: Country code -> fetch_cpi-shaped result dict.
+        """
+        results = await asyncio.gather(
+            *(self.fetch_cpi_async(country, start_date, end_date) for country in countries)
+        )
+        return dict(zip(countries, results))
+
     # Add other methods for fetching other macroeconomic indicators (e.g., interest rates, GDP, etc.) as needed.
 
 if __name__ == '__main__':
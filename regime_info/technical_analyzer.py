@@ -1,47 +1,172 @@
 # regime_info/technical_analyzer.py
+import numpy as np
 import pandas as pd # pandas is great for time series and technical indicators
 from utils.logger import logger
 
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - the rolling kernel degrades to plain Python
+    def njit(*args, **kwargs):
+        """No-op stand-in so the module imports without numba installed."""
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _rolling_mean(arr, window):
+    """
+    Streaming rolling mean: one add and one subtract per step on a running sum,
+    compiled to machine code. At the short series lengths the strategist works
+    with, pandas' rolling machinery costs more than the arithmetic itself.
+    Args:
+        arr (np.ndarray): float64 values.
+        window (int): Rolling window length.
+    Returns:
+        np.ndarray: float64 means; positions before the first full window are NaN.
+    """
+    n = arr.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    running = 0.0
+    for i in range(n):
+        running += arr[i]
+        if i >= window:
+            running -= arr[i - window]
+        if i >= window - 1:
+            out[i] = running / window
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _sma_pair_last(arr, short_window, long_window):
+    """
+    Latest short and long SMAs in one fused pass over the long-window tail,
+    instead of two separate tail reductions over overlapping data.
+    Args:
+        arr (np.ndarray): float64 prices with at least long_window elements.
+        short_window (int): Short SMA window (must be <= long_window).
+        long_window (int): Long SMA window.
+    Returns:
+        tuple: (short SMA, long SMA) over the respective tails.
+    """
+    n = arr.shape[0]
+    sum_short = 0.0
+    sum_long = 0.0
+    short_start = n - short_window
+    for i in range(n - long_window, n):
+        v = arr[i]
+        sum_long += v
+        if i >= short_start:
+            sum_short += v
+    return sum_short / short_window, sum_long / long_window
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _rsi_wilder(arr, window):
+    """
+    Single-pass Wilder RSI: seed the up/down averages with an SMA over the
+    first `window` changes, then apply Wilder's smoothing recurrence. One loop,
+    no intermediate arrays — versus the old pandas version's five temporaries
+    (and its plain-SMA averaging, which diverged from the standard definition).
+    Args:
+        arr (np.ndarray): float64 prices.
+        window (int): RSI period.
+    Returns:
+        np.ndarray: float64 RSI values; positions before the seed window are NaN.
+    """
+    n = arr.shape[0]
+    out = np.full(n, np.nan)
+    if n <= window:
+        return out
+    upavg = 0.0
+    dnavg = 0.0
+    for i in range(1, window + 1):
+        delta = arr[i] - arr[i - 1]
+        if delta > 0.0:
+            upavg += delta
+        else:
+            dnavg -= delta
+    upavg /= window
+    dnavg /= window
+    denom = upavg + dnavg
+    out[window] = 50.0 if denom == 0.0 else 100.0 * upavg / denom
+    for i in range(window + 1, n):
+        delta = arr[i] - arr[i - 1]
+        up = delta if delta > 0.0 else 0.0
+        dn = -delta if delta < 0.0 else 0.0
+        upavg = (upavg * (window - 1) + up) / window
+        dnavg = (dnavg * (window - 1) + dn) / window
+        denom = upavg + dnavg
+        out[i] = 50.0 if denom == 0.0 else 100.0 * upavg / denom
+    return out
+
+
 class TechnicalAnalyzer:
     def __init__(self):
+        # Warm the numba JIT on a tiny series so the first real indicator
+        # call doesn't pay the compile cost inside the per-pair loop. With
+        # cache=True this is a disk load after the first run ever.
+        _rolling_mean(np.zeros(4, dtype=np.float64), 2)
+        _rsi_wilder(np.zeros(4, dtype=np.float64), 2)
+        _sma_pair_last(np.zeros(4, dtype=np.float64), 2, 4)
         logger.info("TechnicalAnalyzer initialized.")
 
     def calculate_sma(self, prices, window):
         """
         Calculates Simple Moving Average (SMA).
         Args:
-            prices (pd.Series): Pandas Series of prices.
+            prices (pd.Series or np.ndarray): Prices; a raw ndarray skips pandas boxing.
             window (int): SMA window period.
         Returns:
-            pd.Series: SMA values.
+            pd.Series: SMA values (plain-indexed when given an ndarray).
         """
         try:
-            sma = prices.rolling(window=window).mean()
-            return sma
+            values = np.asarray(prices, dtype=np.float64)
+            sma = _rolling_mean(values, window)
+            return pd.Series(sma, index=getattr(prices, 'index', None))
         except Exception as e:
             logger.error(f"Error calculating SMA: {e}")
             return None
 
+    def calculate_sma_last(self, prices, window):
+        """
+        Returns only the latest SMA value. Callers that just need the current
+        indicator level skip the full O(N) rolling series (and its allocation)
+        for a single O(window) mean over the tail.
+        Args:
+            prices (pd.Series or np.ndarray): Prices; a raw ndarray skips pandas boxing.
+            window (int): SMA window period.
+        Returns:
+            float: Mean of the last `window` prices, or NaN if not enough data.
+        """
+        try:
+            values = np.asarray(prices, dtype=np.float64)
+            if values.shape[0] < window:
+                return float('nan')
+            return float(values[-window:].mean())
+        except Exception as e:
+            logger.error(f"Error calculating last SMA value: {e}")
+            return None
+
     def calculate_rsi(self, prices, window=14): # Default RSI window is 14
         """
-        Calculates Relative Strength Index (RSI).
+        Calculates Relative Strength Index (RSI) with Wilder's smoothing, the
+        standard definition (matches TradingView/pandas-ta); the previous
+        rolling-SMA averaging over- and under-shot it.
         Args:
-            prices (pd.Series): Pandas Series of prices.
+            prices (pd.Series or np.ndarray): Prices; a raw ndarray skips pandas boxing.
             window (int): RSI window period.
         Returns:
-            pd.Series: RSI values.
+            pd.Series: RSI values (NaN before the seed window fills).
         """
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).fillna(0)
-            loss = (-delta.where(delta < 0, 0)).fillna(0)
-
-            avg_gain = gain.rolling(window=window, min_periods=1).mean()
-            avg_loss = loss.rolling(window=window, min_periods=1).mean()
-
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
+            values = np.asarray(prices, dtype=np.float64)
+            rsi = _rsi_wilder(values, window)
+            return pd.Series(rsi, index=getattr(prices, 'index', None))
         except Exception as e:
             logger.error(f"Error calculating RSI: {e}")
             return None
@@ -60,8 +185,7 @@ if __name__ == '__main__':
     interval = "1d"
     raw_data = fetcher.fetch_historical_data(pair, interval=interval, limit=200) # Get enough data for SMAs and RSI
     if raw_data:
-        cleaned_data = cleaner.clean_historical_data(raw_data)
-        df = pd.DataFrame(cleaned_data) # Convert to Pandas DataFrame for easier processing
+        df = cleaner.clean_historical_data(raw_data) # Already a Pandas DataFrame
         close_prices = df['close']
 
         sma_50 = analyzer.calculate_sma(close_prices, window=50)
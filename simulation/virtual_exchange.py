@@ -1,19 +1,51 @@
 # simulation/virtual_exchange.py
 import time
-import random
+import numpy as np
+import pandas as pd
 from utils.logger import logger
 
 class VirtualExchange:
-    def __init__(self, latency_mean=0.1, latency_std=0.02, slippage_mean=0.0001, slippage_std=0.00005):
+    def __init__(self, latency_mean=0.1, latency_std=0.02, slippage_mean=0.0001, slippage_std=0.00005,
+                 simulate_wall_clock=False):
         self.latency_mean = latency_mean  # Mean latency in seconds
         self.latency_std = latency_std  # Standard deviation of latency
         self.slippage_mean = slippage_mean # Mean slippage (as a fraction of price, e.g., 0.0001 means 0.01% slippage)
         self.slippage_std = slippage_std # Standard deviation of slippage
+        # When False (the default), the sampled latency is only recorded in the
+        # result instead of actually slept — simulated time, not wall time.
+        # Backtests would otherwise be capped at ~1/latency_mean orders/sec.
+        # Set True for real-time paper trading where pacing should feel live.
+        self.simulate_wall_clock = simulate_wall_clock
+        self._rng = np.random.default_rng()  # Bulk sampler for batch and buffered scalar paths
+        self._buf_size = 8192
+        self._prebuffer()
         logger.info("VirtualExchange initialized with latency and slippage simulation.")
 
+    def _prebuffer(self):
+        """
+        Refills the latency/slippage sample buffers with one vectorized draw
+        each, amortizing RNG cost across ~8K scalar execute_order calls
+        (random.gauss per order was two slow Python-level samples).
+        """
+        self._latency_buf = np.maximum(
+            self._rng.normal(self.latency_mean, self.latency_std, self._buf_size), 0.0)
+        self._slippage_buf = self._rng.normal(self.slippage_mean, self.slippage_std, self._buf_size)
+        self._buf_idx = 0
+
+    def _next_samples(self):
+        """Pops one (latency, slippage) pair, refilling the buffers when drained."""
+        if self._buf_idx >= self._buf_size:
+            self._prebuffer()
+        i = self._buf_idx
+        self._buf_idx += 1
+        return self._latency_buf[i], self._slippage_buf[i]
+
     def execute_order(self, order_params):
         """
         Simulates order execution on a virtual exchange with latency and slippage.
+        Thin dict adapter over execute_order_args for existing callers; loops
+        that already hold the fields can call execute_order_args directly and
+        skip the dict lookups.
         Args:
             order_params (dict): Dictionary containing order details:
                                  {'order_type': 'buy'/'sell', 'symbol': 'BTC', 'amount': float, 'price': float}
@@ -25,10 +57,23 @@ class VirtualExchange:
         amount = order_params.get('amount')
         price = order_params.get('price')
 
-        if not all([order_type, symbol, amount, price]):
+        if not (order_type and symbol and amount and price):
             logger.error(f"Invalid order parameters: {order_params}. Missing order_type, symbol, amount, or price.")
             return {'status': 'failure', 'message': 'Invalid order parameters'}
 
+        return self.execute_order_args(order_type, symbol, amount, price)
+
+    def execute_order_args(self, order_type, symbol, amount, price):
+        """
+        Simulates execution from explicit arguments — the actual order logic.
+        Args:
+            order_type (str): 'buy' or 'sell'.
+            symbol (str): Asset symbol (e.g., 'BTC').
+            amount (float): Order amount; must be positive.
+            price (float): Requested price; must be positive.
+        Returns:
+            dict: Same result shape as execute_order.
+        """
         if order_type not in ['buy', 'sell']:
             logger.error(f"Invalid order type: {order_type}. Must be 'buy' or 'sell'.")
             return {'status': 'failure', 'message': 'Invalid order type'}
@@ -37,13 +82,11 @@ class VirtualExchange:
             logger.error(f"Invalid order amount or price. Amount: {amount}, Price: {price}. Must be positive values.")
             return {'status': 'failure', 'message': 'Invalid amount or price'}
 
-        # Simulate Latency
-        latency = random.gauss(self.latency_mean, self.latency_std)
-        latency = max(0, latency)  # Ensure latency is not negative
-        time.sleep(latency)
-
-        # Simulate Slippage
-        slippage_factor = random.gauss(self.slippage_mean, self.slippage_std)
+        # Simulate latency and slippage from the pre-sampled buffers
+        # (latency is already clamped non-negative at buffer fill time)
+        latency, slippage_factor = self._next_samples()
+        if self.simulate_wall_clock:
+            time.sleep(latency)
         if order_type == 'buy':
             executed_price = price * (1 + slippage_factor)  # Buyer pays more due to slippage
         else:  # order_type == 'sell'
@@ -51,7 +94,10 @@ class VirtualExchange:
 
         executed_amount = amount
 
-        logger.info(f"Virtual Exchange: Executed {order_type} order for {executed_amount:.4f} {symbol} at ${executed_price:.2f} (requested price: ${price:.2f}, latency: {latency:.3f}s)")
+        # %-style args: logging skips the formatting entirely when backtests
+        # run at WARNING level, which is where per-order strings dominate.
+        logger.info("Virtual Exchange: Executed %s order for %.4f %s at $%.2f (requested price: $%.2f, latency: %.3fs)",
+                    order_type, executed_amount, symbol, executed_price, price, latency)
         return {
             'status': 'success',
             'executed_price': executed_price,
@@ -61,6 +107,48 @@ class VirtualExchange:
             'latency': latency
         }
 
+    def execute_orders(self, orders):
+        """
+        Simulates execution for a whole batch of orders with vectorized NumPy
+        sampling: validation, slippage, and latency are each one array
+        operation instead of N execute_order calls. Latency is recorded but
+        never slept — this path exists for backtests, where only simulated
+        time matters.
+        Args:
+            orders (pd.DataFrame): One order per row with columns
+                                   'order_type', 'symbol', 'amount', 'price'.
+        Returns:
+            pd.DataFrame: Per-order results aligned to the input index with the
+                          same fields execute_order returns; invalid rows get
+                          status 'failure' and NaN execution values.
+        """
+        n = len(orders)
+        order_type = orders['order_type'].to_numpy()
+        amount = orders['amount'].to_numpy(dtype=np.float64)
+        price = orders['price'].to_numpy(dtype=np.float64)
+
+        valid = np.isin(order_type, ('buy', 'sell')) & (amount > 0) & (price > 0)
+        invalid_count = int(n - valid.sum())
+        if invalid_count:
+            logger.error("%d invalid order(s) in batch of %d; marked as failures.", invalid_count, n)
+
+        latency = np.maximum(self._rng.normal(self.latency_mean, self.latency_std, n), 0.0)
+        slippage = self._rng.normal(self.slippage_mean, self.slippage_std, n)
+        sign = np.where(order_type == 'buy', 1.0, -1.0)  # Buyers pay more, sellers receive less
+        executed_price = np.where(valid, price * (1.0 + sign * slippage), np.nan)
+
+        results = pd.DataFrame({
+            'status': np.where(valid, 'success', 'failure'),
+            'executed_price': executed_price,
+            'executed_amount': np.where(valid, amount, np.nan),
+            'symbol': orders['symbol'].to_numpy(),
+            'order_type': order_type,
+            'latency': np.where(valid, latency, np.nan),
+        }, index=orders.index)
+        logger.info("Virtual Exchange: executed batch of %d order(s) (%d failed).", n, invalid_count)
+        return results
+
+
 if __name__ == '__main__':
     virtual_exchange = VirtualExchange()
 
@@ -1,14 +1,16 @@
 # strategist/execution_coordinator.py
+import time
 import pandas as pd
-from simulation.virtual_exchange import VirtualExchange
 from trading_core.portfolio_manager import PortfolioManager
 from trading_core.event_logger import EventLogger
+from utils.columnar_trade_log import TradeLog, SIDE_BUY, SIDE_SELL
 from utils.logger import logger
 
 class ExecutionCoordinator:
     def __init__(self, mode="simulation"): # Default to simulation mode
         self.mode = mode
         if self.mode == "simulation":
+            from simulation.virtual_exchange import VirtualExchange # Import only for simulation mode
             self.exchange = VirtualExchange() # Use VirtualExchange for simulation
         elif self.mode == "live":
             from trader.exchange_connector import ExchangeConnector # Import only for live mode
@@ -18,17 +20,49 @@ class ExecutionCoordinator:
 
         self.portfolio_manager = PortfolioManager() # Initialize portfolio manager
         self.event_logger = EventLogger() # Initialize event logger
+        # Columnar in-memory mirror of the trade history: five scalar stores
+        # per fill, and analytics read it as a DataFrame without pivoting a
+        # list of dicts (see utils.columnar_trade_log).
+        self.trade_log = TradeLog()
         logger.info(f"ExecutionCoordinator initialized in {self.mode} mode.")
 
     def execute_trade(self, order_params):
         """
         Executes a trade through the appropriate exchange (virtual or real) and updates portfolio.
+        Thin dict adapter over execute_trade_args, mirroring
+        VirtualExchange.execute_order; callers that already hold the fields
+        can call execute_trade_args directly and skip the dict round-trip.
         Args:
             order_params (dict): Order parameters (same format as VirtualExchange.execute_order).
         Returns:
             dict: Order execution result (from VirtualExchange or ExchangeConnector).
         """
-        execution_result = self.exchange.execute_order(order_params) # Execute order on virtual/real exchange
+        return self.execute_trade_args(
+            order_params.get('order_type'), order_params.get('symbol'),
+            order_params.get('amount'), order_params.get('price'))
+
+    def execute_trade_args(self, order_type, symbol, amount, price):
+        """
+        Executes a trade from explicit arguments — the actual flow. Uses the
+        exchange's explicit-args entry point when it has one, so strategist
+        loops that trade per pair never build a throwaway params dict.
+        Args:
+            order_type (str): 'buy' or 'sell'.
+            symbol (str): Asset symbol (e.g., 'BTC').
+            amount (float): Order amount.
+            price (float): Requested price.
+        Returns:
+            dict: Order execution result (from VirtualExchange or ExchangeConnector).
+        """
+        # Free performance counter: monotonic clock around the exchange call
+        # (two VDSO reads) surfaces the real round-trip per order.
+        t0 = time.monotonic_ns()
+        if hasattr(self.exchange, 'execute_order_args'):
+            execution_result = self.exchange.execute_order_args(order_type, symbol, amount, price)
+        else:
+            execution_result = self.exchange.execute_order(
+                {'order_type': order_type, 'symbol': symbol, 'amount': amount, 'price': price})
+        execution_result['exchange_latency_ns'] = time.monotonic_ns() - t0
 
         if execution_result['status'] == 'success':
             executed_price = execution_result['executed_price']
@@ -36,26 +70,91 @@ class ExecutionCoordinator:
             symbol = execution_result['symbol']
             order_type = execution_result['order_type']
 
-            # Update portfolio and log trade
-            trade_success = self.portfolio_manager.execute_trade(order_type, symbol, executed_amount, executed_price)
+            # Update portfolio and log trade; amount * price is computed once
+            # here and threaded through to the portfolio and the log record.
+            usd_value = executed_amount * executed_price
+            trade_success = self.portfolio_manager.execute_trade(
+                order_type, symbol, executed_amount, executed_price, usd_value=usd_value)
             if trade_success:
                 trade_record = {
                     'type': order_type,
                     'symbol': symbol,
                     'amount': executed_amount,
                     'price': executed_price,
-                    'usd_value': executed_amount * executed_price,
-                    'timestamp': pd.Timestamp.now() # Or get timestamp from exchange response if available in real trading
+                    'usd_value': usd_value,
+                    # Epoch nanoseconds: one clock syscall, versus the tz-aware
+                    # object pd.Timestamp.now() builds per trade. Render to a
+                    # human timestamp at read time, not on the trading path.
+                    'ts_ns': time.time_ns() # Or get timestamp from exchange response if available in real trading
                 }
                 self.event_logger.log_trade(trade_record)
+                self.trade_log.append(trade_record['ts_ns'], symbol,
+                                      SIDE_BUY if order_type == 'buy' else SIDE_SELL,
+                                      executed_amount, executed_price)
             else:
-                logger.error(f"Portfolio update failed after successful order execution. Order params: {order_params}, Execution result: {execution_result}")
+                logger.error(f"Portfolio update failed after successful order execution. Order: {order_type} {amount} {symbol} at {price}, Execution result: {execution_result}")
                 execution_result['status'] = 'failure' # Mark overall execution as failure if portfolio update fails
         else:
-            logger.warning(f"Order execution failed. Order params: {order_params}, Execution result: {execution_result}")
+            logger.warning(f"Order execution failed. Order: {order_type} {amount} {symbol} at {price}, Execution result: {execution_result}")
 
         return execution_result
 
+    def execute_trades(self, orders):
+        """
+        Batch variant of execute_trade: submits all orders in one exchange
+        call where the exchange supports it (VirtualExchange.execute_orders),
+        then applies portfolio updates and trade logging per fill. Portfolio
+        state stays sequential — only the exchange round-trips are batched.
+        Args:
+            orders (list): Order parameter dicts (same format as execute_trade).
+        Returns:
+            list: One execution result dict per order, in input order.
+        """
+        if not orders:
+            return []
+        if not hasattr(self.exchange, 'execute_orders'):
+            # Live connector has no batch execution result path yet; fall back
+            # to the per-order flow.
+            return [self.execute_trade(order_params) for order_params in orders]
+
+        results = self.exchange.execute_orders(pd.DataFrame(orders)).to_dict('records')
+        fills = [r for r in results if r['status'] == 'success']
+        for execution_result in results:
+            if execution_result['status'] != 'success':
+                logger.warning(f"Order execution failed in batch. Execution result: {execution_result}")
+        if not fills:
+            return results
+
+        # One bulk portfolio call for all fills, then one timestamp read for
+        # the whole batch; the event logger's writer thread groups the queued
+        # records into a single disk write.
+        for fill in fills:
+            fill['usd_value'] = fill['executed_amount'] * fill['executed_price']
+        trade_success = self.portfolio_manager.execute_trades([
+            {'order_type': fill['order_type'], 'symbol': fill['symbol'],
+             'amount': fill['executed_amount'], 'price': fill['executed_price'],
+             'usd_value': fill['usd_value']}
+            for fill in fills
+        ])
+        ts_ns = time.time_ns()
+        for fill, success in zip(fills, trade_success):
+            if success:
+                self.event_logger.log_trade({
+                    'type': fill['order_type'],
+                    'symbol': fill['symbol'],
+                    'amount': fill['executed_amount'],
+                    'price': fill['executed_price'],
+                    'usd_value': fill['usd_value'],
+                    'ts_ns': ts_ns
+                })
+                self.trade_log.append(ts_ns, fill['symbol'],
+                                      SIDE_BUY if fill['order_type'] == 'buy' else SIDE_SELL,
+                                      fill['executed_amount'], fill['executed_price'])
+            else:
+                logger.error(f"Portfolio update failed after successful batch execution. Execution result: {fill}")
+                fill['status'] = 'failure'
+        return results
+
     def get_portfolio_status(self, current_prices_usd=None):
         """
         Returns the current portfolio status (balance, positions, PnL).
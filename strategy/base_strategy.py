@@ -1,13 +1,31 @@
 # strategy/base_strategy.py
 from abc import ABC, abstractmethod
+from types import MappingProxyType
 import pandas as pd
 
+# Numeric signal codes, matching the int8 convention of the vectorized and
+# batch APIs. Engines that branch per bar compare small ints instead of
+# hashing 'buy'/'sell'/'hold' strings; the names stay for logs and callers
+# of the string API.
+SIGNAL_BUY = 1
+SIGNAL_SELL = -1
+SIGNAL_HOLD = 0
+SIGNAL_NAMES = {SIGNAL_BUY: 'buy', SIGNAL_SELL: 'sell', SIGNAL_HOLD: 'hold'}
+_SIGNAL_CODES = {'buy': SIGNAL_BUY, 'sell': SIGNAL_SELL, 'hold': SIGNAL_HOLD}
+
+
 class BaseStrategy(ABC):
     """
     Abstract base class for trading strategies.
     All concrete strategies must inherit from this class and implement the abstract methods.
     """
 
+    # Slots instead of a per-instance __dict__: a parameter sweep instantiates
+    # thousands of strategies, and slot storage cuts ~300 bytes of dict per
+    # instance while making attribute reads a fixed-offset load. Subclasses
+    # must declare __slots__ for their own attributes to keep the benefit.
+    __slots__ = ('name', 'symbol', 'params')
+
     def __init__(self, name, symbol, params=None):
         """
         Constructor for BaseStrategy.
@@ -18,21 +36,108 @@ class BaseStrategy(ABC):
         """
         self.name = name
         self.symbol = symbol
-        self.params = params or {} # Ensure params is always a dict, even if None is passed
+        # Read-only view: params can be cached and shared safely because no
+        # caller can mutate them after construction.
+        self.params = MappingProxyType(dict(params) if params else {})
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Validates every concrete subclass once, at class-definition time.
+        This warms StrategyValidator's per-class cache while modules load, so
+        runtime validate_strategy calls — per backtest, per hot-reload scan —
+        are pure cache hits. Invalid classes still only surface through
+        validate_strategy's (False, message) result, as before.
+        """
+        super().__init_subclass__(**kwargs)
+        # Imported lazily: strategy_validator imports this module at its top.
+        from strategy.strategy_validator import _validate_class
+        _validate_class(cls)
 
     @abstractmethod
-    def generate_signal(self, historical_data: pd.DataFrame, current_price: float = None) -> str:
+    def generate_signal(self, historical_data: pd.DataFrame, current_price: float = None, bar_index: int = None) -> str:
         """
         Abstract method to generate a trading signal based on historical data and optionally current price.
         Subclasses must implement this method to define their strategy logic.
         Args:
             historical_data (pd.DataFrame): DataFrame containing historical market data.
             current_price (float, optional): Current price (if available/needed for strategy logic). Defaults to None.
+            bar_index (int, optional): Integer position of the current bar inside historical_data.
+                When provided (backtesting), historical_data is the FULL data set and the strategy
+                must only use rows up to and including bar_index. This avoids slicing a growing
+                copy of the DataFrame per bar. When None (live trading), historical_data ends at
+                the current bar as before.
         Returns:
             str: Trading signal: 'buy', 'sell', or 'hold'.
         """
         pass # Abstract method - must be implemented in subclasses
 
+    def generate_signal_code(self, historical_data: pd.DataFrame, current_price: float = None, bar_index: int = None):
+        """
+        Numeric form of generate_signal: SIGNAL_BUY (+1), SIGNAL_SELL (-1),
+        SIGNAL_HOLD (0). Hot loops branch on the int instead of comparing
+        strings per bar. The default maps the string result through a lookup;
+        strategies that compute their signal numerically should override this
+        (and derive generate_signal from it) so no string is built at all.
+        Args:
+            historical_data (pd.DataFrame): Same as generate_signal.
+            current_price (float, optional): Same as generate_signal.
+            bar_index (int, optional): Same as generate_signal.
+        Returns:
+            int or None: Signal code, or None for an unrecognized string signal.
+        """
+        return _SIGNAL_CODES.get(self.generate_signal(historical_data, current_price, bar_index))
+
+    def generate_signals_vectorized(self, historical_data: pd.DataFrame):
+        """
+        Optional vectorized signal generation for the whole data set in one pass.
+        Strategies that can express their logic as array operations should override this
+        and return a numpy int8 array of the same length as historical_data with values:
+        +1 (buy), -1 (sell), 0 (hold). BacktestEngine.run_vectorized uses this to replace
+        the per-bar Python loop entirely. Strategies that cannot be vectorized simply
+        leave this unimplemented and are backtested with the event-driven loop.
+        Args:
+            historical_data (pd.DataFrame): Full DataFrame of historical market data.
+        Returns:
+            np.ndarray: int8 array of signals in {-1, 0, +1}.
+        """
+        raise NotImplementedError(f"Strategy {self.name} does not provide vectorized signals.")
+
+    def generate_signals_batch(self, close_2d, high_2d=None, low_2d=None):
+        """
+        Optional batch signal generation over many symbols at once. Strategies
+        whose logic is columnwise-independent should override this to take a
+        (T, N) matrix — T bars by N symbols — and return an int8 matrix of the
+        same shape with +1 (buy), -1 (sell), 0 (hold) per cell. This lets a
+        runner evaluate every symbol in one compiled pass instead of N
+        per-symbol generate_signal calls. Strategies that cannot batch simply
+        leave this unimplemented and are evaluated one symbol at a time.
+        Args:
+            close_2d (np.ndarray): float64 close matrix of shape (T, N).
+            high_2d (np.ndarray, optional): High matrix, for range-based strategies.
+            low_2d (np.ndarray, optional): Low matrix, for range-based strategies.
+        Returns:
+            np.ndarray: int8 signal matrix of shape (T, N) in {-1, 0, +1}.
+        """
+        raise NotImplementedError(f"Strategy {self.name} does not provide batch signals.")
+
+    def precompute(self, historical_data: pd.DataFrame):
+        """
+        Computes the whole signal series in one pass before a backtest begins.
+        Indicators and signals are derived together from a single scan of the price
+        data instead of being recomputed bar by bar. The default implementation
+        delegates to generate_signals_vectorized; strategies that only implement
+        per-bar logic get None back, and the backtest loop falls back to calling
+        generate_signal per bar.
+        Args:
+            historical_data (pd.DataFrame): Full DataFrame of historical market data.
+        Returns:
+            np.ndarray or None: int8 signals in {-1, 0, +1} for every bar, or None.
+        """
+        try:
+            return self.generate_signals_vectorized(historical_data)
+        except NotImplementedError:
+            return None
+
     def get_strategy_name(self):
         """Returns the name of the strategy."""
         return self.name
@@ -54,7 +159,7 @@ class BaseStrategy(ABC):
 #     def __init__(self, symbol, params=None):
 #         super().__init__(name="Example Strategy", symbol=symbol, params=params) # You can set a name here
 #
-#     def generate_signal(self, historical_data: pd.DataFrame, current_price: float = None) -> str:
+#     def generate_signal(self, historical_data: pd.DataFrame, current_price: float = None, bar_index: int = None) -> str:
 #         # ... Strategy logic here ...
 #         return 'buy' or 'sell' or 'hold'
 
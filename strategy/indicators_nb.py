@@ -0,0 +1,180 @@
+# strategy/indicators_nb.py
+"""
+Shared numba rolling-indicator kernels for strategies.
+
+Each kernel is a single pass over contiguous float64 arrays with running
+state (sums or a monotonic deque), so a strategy calls `.to_numpy()` once
+and gets its whole indicator series without pandas' per-window dispatch or
+the handful of temporary Series the rolling/where/concat style allocates.
+All kernels return NaN before the first full window.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - kernels degrade to plain Python
+    def njit(*args, **kwargs):
+        """No-op stand-in so the module imports without numba installed."""
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def sma(x, window):
+    """
+    Rolling simple moving average via a running sum — one add and one
+    subtract per step.
+    Args:
+        x (np.ndarray): float64 values.
+        window (int): Rolling window length.
+    Returns:
+        np.ndarray: float64 means; NaN before the first full window.
+    """
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    running = 0.0
+    for i in range(n):
+        running += x[i]
+        if i >= window:
+            running -= x[i - window]
+        if i >= window - 1:
+            out[i] = running / window
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def rsi_wilder(close, window):
+    """
+    Single-pass Wilder RSI: seed the up/down averages with an SMA over the
+    first `window` changes, then apply Wilder's smoothing recurrence. Flat
+    stretches (zero denominator) read as 50.
+    Args:
+        close (np.ndarray): float64 closing prices.
+        window (int): RSI period.
+    Returns:
+        np.ndarray: float64 RSI values; NaN before the seed window fills.
+    """
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    if n <= window:
+        return out
+    upavg = 0.0
+    dnavg = 0.0
+    for i in range(1, window + 1):
+        delta = close[i] - close[i - 1]
+        if delta > 0.0:
+            upavg += delta
+        else:
+            dnavg -= delta
+    upavg /= window
+    dnavg /= window
+    denom = upavg + dnavg
+    out[window] = 50.0 if denom == 0.0 else 100.0 * upavg / denom
+    for i in range(window + 1, n):
+        delta = close[i] - close[i - 1]
+        up = delta if delta > 0.0 else 0.0
+        dn = -delta if delta < 0.0 else 0.0
+        upavg = (upavg * (window - 1) + up) / window
+        dnavg = (dnavg * (window - 1) + dn) / window
+        denom = upavg + dnavg
+        out[i] = 50.0 if denom == 0.0 else 100.0 * upavg / denom
+    return out
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def atr(high, low, close, window):
+    """
+    Average True Range with Wilder smoothing. True range folds the gap to the
+    previous close into the bar range; the seed is an SMA of the first
+    `window` true ranges, then the same recurrence as rsi_wilder.
+    Args:
+        high (np.ndarray): float64 high prices.
+        low (np.ndarray): float64 low prices.
+        close (np.ndarray): float64 closing prices.
+        window (int): ATR period.
+    Returns:
+        np.ndarray: float64 ATR values; NaN before the seed window fills.
+    """
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    tr_sum = high[0] - low[0]
+    for i in range(1, window):
+        hl = high[i] - low[i]
+        hc = abs(high[i] - close[i - 1])
+        lc = abs(low[i] - close[i - 1])
+        tr = max(hl, hc, lc)
+        tr_sum += tr
+    atr_val = tr_sum / window
+    out[window - 1] = atr_val
+    for i in range(window, n):
+        hl = high[i] - low[i]
+        hc = abs(high[i] - close[i - 1])
+        lc = abs(low[i] - close[i - 1])
+        tr = max(hl, hc, lc)
+        atr_val = (atr_val * (window - 1) + tr) / window
+        out[i] = atr_val
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rolling_min(x, window):
+    """
+    Rolling minimum via a monotonic deque of candidate indices — amortized
+    O(1) per step versus the O(window) rescan of .rolling().min(). Useful
+    for support levels.
+    Args:
+        x (np.ndarray): float64 values.
+        window (int): Rolling window length.
+    Returns:
+        np.ndarray: float64 minima; NaN before the first full window.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    idx = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0  # deque occupies idx[head:tail], values increasing
+    for i in range(n):
+        while tail > head and x[idx[tail - 1]] >= x[i]:
+            tail -= 1
+        idx[tail] = i
+        tail += 1
+        if idx[head] <= i - window:
+            head += 1
+        if i >= window - 1:
+            out[i] = x[idx[head]]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rolling_max(x, window):
+    """
+    Rolling maximum via a monotonic deque; mirror of rolling_min. Useful for
+    resistance levels.
+    Args:
+        x (np.ndarray): float64 values.
+        window (int): Rolling window length.
+    Returns:
+        np.ndarray: float64 maxima; NaN before the first full window.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    idx = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0  # deque occupies idx[head:tail], values decreasing
+    for i in range(n):
+        while tail > head and x[idx[tail - 1]] <= x[i]:
+            tail -= 1
+        idx[tail] = i
+        tail += 1
+        if idx[head] <= i - window:
+            head += 1
+        if i >= window - 1:
+            out[i] = x[idx[head]]
+    return out
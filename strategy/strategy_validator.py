@@ -1,46 +1,64 @@
 import inspect
+from functools import lru_cache
 from strategy.base_strategy import BaseStrategy
 
+# Reflected once at import time: the base signature never changes at runtime,
+# so re-walking BaseStrategy.generate_signal per validation is pure overhead.
+_BASE_SIG = inspect.signature(BaseStrategy.generate_signal)
+_REQUIRED_METHODS = ('generate_signal',)
+
+
+@lru_cache(maxsize=256)
+def _validate_class(strategy_class):
+    """
+    The actual validation, memoized per class object. inspect.signature builds
+    a full Signature from __code__ on every call (hundreds of microseconds);
+    validation results are immutable for a given class, so repeat validations
+    — per backtest run, per hot-reload factory call — become a dict lookup.
+    A reloaded module produces a new class object and therefore a fresh entry.
+    """
+    # Check if class inherits from BaseStrategy
+    if not issubclass(strategy_class, BaseStrategy):
+        return False, "Strategy must inherit from BaseStrategy"
+
+    # Check required methods
+    for method in _REQUIRED_METHODS:
+        if not hasattr(strategy_class, method):
+            return False, f"Missing required method: {method}"
+
+        # Check method signature matches the base class (reflected once above)
+        strategy_method = getattr(strategy_class, method)
+        if not _BASE_SIG == inspect.signature(strategy_method):
+            return False, f"Method signature mismatch for {method}"
+
+    # Check __init__ calls super().__init__ with name
+    init_signature = inspect.signature(strategy_class.__init__)
+    if 'name' not in init_signature.parameters:
+        return False, "__init__ must accept 'name' parameter"
+
+    return True, "Strategy is valid"
+
+
 class StrategyValidator:
     """Validates that strategy implementations follow required structure"""
-    
+
     @staticmethod
     def validate_strategy(strategy_class):
         """
         Validates that a strategy class implements required methods and follows structure.
+        Results are cached per class, so only the first validation of a class
+        pays the reflection cost.
         Args:
             strategy_class: The strategy class to validate
         Returns:
             tuple: (bool: is_valid, str: error_message)
         """
-        # Check if class inherits from BaseStrategy
-        if not issubclass(strategy_class, BaseStrategy):
-            return False, "Strategy must inherit from BaseStrategy"
-            
-        # Check required methods
-        required_methods = ['generate_signal']
-        for method in required_methods:
-            if not hasattr(strategy_class, method):
-                return False, f"Missing required method: {method}"
-                
-            # Check method signature matches base class
-            base_method = getattr(BaseStrategy, method)
-            strategy_method = getattr(strategy_class, method)
-            
-            if not inspect.signature(base_method) == inspect.signature(strategy_method):
-                return False, f"Method signature mismatch for {method}"
-                
-        # Check __init__ calls super().__init__ with name
-        init_signature = inspect.signature(strategy_class.__init__)
-        if 'name' not in init_signature.parameters:
-            return False, "__init__ must accept 'name' parameter"
-            
-        return True, "Strategy is valid"
+        return _validate_class(strategy_class)
 
 if __name__ == "__main__":
     # Example usage
     from strategy.approved.bull.ema_crossover import Strategy as EMACrossover
-    
+
     is_valid, msg = StrategyValidator.validate_strategy(EMACrossover)
     print(f"Strategy valid: {is_valid}")
-    print(f"Validation message: {msg}")
\ No newline at end of file
+    print(f"Validation message: {msg}")
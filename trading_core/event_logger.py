@@ -1,40 +1,136 @@
 # trading_core/event_logger.py
+import atexit
 import csv
 import os
+import queue
+import threading
+import time
+import orjson
 from utils.logger import logger
-import pandas as pd
 
 class EventLogger:
-    def __init__(self, log_dir='data/logs', filename='transactions.csv'):
+    # Upper bound on how many queued events one file open absorbs; larger
+    # bursts are split across consecutive batches.
+    _MAX_BATCH = 64
+
+    def __init__(self, log_dir='data/logs', filename='transactions.csv', format='csv'):
+        if format not in ('csv', 'jsonl'):
+            raise ValueError(f"Invalid format: {format}. Must be 'csv' or 'jsonl'.")
+        self.format = format
+        if format == 'jsonl' and filename.endswith('.csv'):
+            filename = filename[:-len('.csv')] + '.jsonl'
         self.log_dir = log_dir
         self.filename = filename
         self.filepath = os.path.join(self.log_dir, self.filename)
         self._ensure_log_directory_exists()
-        self.header_written = os.path.exists(self.filepath) and os.path.getsize(self.filepath) > 0 # Check if file exists and is not empty
+        # One long-lived append handle with a 1 MiB userspace buffer: rows
+        # accumulate in memory and hit the kernel in large writes, instead of
+        # an open/close syscall pair per batch. Fieldnames are cached from
+        # the first event so later rows skip per-row DictWriter dispatch.
+        # The jsonl backend writes orjson-encoded bytes (C-level
+        # serialization, no fieldnames at all), one record per line.
+        self._fh = self._open('a')
+        # Append mode starts positioned at end-of-file, so the handle itself
+        # says whether a header already exists — no extra stat calls.
+        self.header_written = self._fh.tell() > 0
+        self._fh_lock = threading.Lock()
+        self._fields = None
+        # Events go through a queue to a background writer so the trading
+        # path never blocks on the disk; the writer drains whole bursts into
+        # one buffered write, amortizing the per-event cost across the batch.
+        self._queue = queue.Queue()
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, daemon=True, name="event-log-writer")
+        self._writer_thread.start()
+        atexit.register(self.close)
+
+    def _open(self, mode):
+        """Opens the log file with the backend's mode (binary for jsonl)."""
+        if self.format == 'jsonl':
+            return open(self.filepath, mode + 'b', buffering=1 << 20)
+        return open(self.filepath, mode, newline='', buffering=1 << 20)
 
     def _ensure_log_directory_exists(self):
-        """Creates the log directory if it doesn't exist."""
-        if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
+        """Creates the log directory if it doesn't exist. exist_ok makes it
+        one atomic mkdir instead of a stat + mkdir pair (and race-free when
+        parallel workers construct loggers concurrently)."""
+        os.makedirs(self.log_dir, exist_ok=True)
+
+    def _writer_loop(self):
+        """
+        Background drain: blocks for the first event, then grabs whatever
+        else has accumulated (up to _MAX_BATCH) so a burst of trades costs
+        one file open and one buffered write instead of one per trade.
+        """
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_batch(self, batch):
+        """Appends a batch of event dicts through the long-lived handle."""
+        try:
+            with self._fh_lock:
+                if self.format == 'jsonl':
+                    self._fh.write(b''.join(
+                        orjson.dumps(event, option=orjson.OPT_SERIALIZE_NUMPY, default=str) + b'\n'
+                        for event in batch))
+                else:
+                    if self._fields is None:
+                        self._fields = list(batch[0].keys())
+                    writer = csv.writer(self._fh)
+                    if not self.header_written: # Write header only if not already written
+                        writer.writerow(self._fields)
+                        self.header_written = True
+                    writer.writerows([[event.get(k, '') for k in self._fields] for event in batch])
+            logger.debug(f"{len(batch)} event(s) logged to {self.filepath}")
+        except Exception as e:
+            logger.error(f"Error logging events: {e}")
+
+    def flush(self):
+        """Blocks until every queued event has been written, then pushes the
+        userspace buffer to the OS so the file can be read back."""
+        self._queue.join()
+        with self._fh_lock:
+            if not self._fh.closed:
+                self._fh.flush()
+
+    def close(self):
+        """Flushes queued events and closes the file handle. Safe to call
+        more than once (also registered via atexit)."""
+        self._queue.join()
+        with self._fh_lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+    def reset(self):
+        """
+        Truncates the log file and resets the header flag so the same instance can be
+        reused for a fresh run instead of constructing a new EventLogger.
+        """
+        self.flush() # Don't let in-flight events land in the fresh file
+        with self._fh_lock:
+            self._fh.close()
+            self._fh = self._open('w')
+            self.header_written = False
+            self._fields = None
 
     def log_event(self, event_data):
         """
-        Logs a trading event to the CSV file.
+        Logs a trading event to the CSV file. Fire-and-forget: the record is
+        enqueued for the background writer, so callers return immediately
+        instead of waiting out the append. Call flush() before reading the
+        file back.
         Args:
             event_data (dict): Dictionary containing event details (e.g., trade details).
         """
-        try:
-            with open(self.filepath, mode='a', newline='') as csvfile:
-                fieldnames = event_data.keys()
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                if not self.header_written: # Write header only if not already written
-                    writer.writeheader()
-                    self.header_written = True
-                writer.writerow(event_data)
-            logger.debug(f"Event logged to {self.filepath}: {event_data}")
-        except Exception as e:
-            logger.error(f"Error logging event to CSV: {e}")
+        self._queue.put(event_data)
 
     def log_trade(self, trade_record):
         """
@@ -55,10 +151,11 @@ if __name__ == '__main__':
         'amount': 0.01,
         'price': 30500.00,
         'usd_value': 305.00,
-        'timestamp': pd.Timestamp.now() # Or use a string timestamp if you prefer
+        'ts_ns': time.time_ns() # Epoch nanoseconds, as stamped by the trading path
     }
 
     event_logger.log_trade(example_trade)
+    event_logger.flush() # Make sure the record hits disk before the process exits
     print(f"Logged example trade to {event_logger.filepath}")
 
-    # You can check the data/logs/transactions.csv file to see the logged event.
\ No newline at end of file
+    # You can check the data/logs/transactions.csv file to see the logged event.
@@ -1,24 +1,137 @@
 # trading_core/portfolio_manager.py
+import time
+
 from utils.logger import logger
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - kernel degrades to plain Python
+    def njit(*args, **kwargs):
+        """No-op stand-in so the module imports without numba installed."""
+        def decorator(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return decorator
+
+
+# No fastmath: the kernel must see NaN (missing price) and skip it, same as
+# the rolling min/max kernels in strategy.indicators_nb.
+@njit(cache=True, nogil=True)
+def _value_and_pnl(amounts, avg_prices, prices, pnl_out):
+    """
+    Fused valuation + PnL over the position arrays in one loop. For the
+    typical 1-20 symbol portfolio the per-ufunc Python dispatch cost of the
+    NumPy expressions dominates the arithmetic; one jitted pass removes it.
+    Args:
+        amounts (np.ndarray): float64 held amounts, one row per symbol.
+        avg_prices (np.ndarray): float64 average entry prices.
+        prices (np.ndarray): float64 current prices, NaN where unknown.
+        pnl_out (np.ndarray): float64 output, per-position PnL (0 where the
+            price is missing).
+    Returns:
+        tuple: (positions_value, total_pnl) with NaN-priced rows skipped.
+    """
+    value = 0.0
+    total_pnl = 0.0
+    for i in range(amounts.shape[0]):
+        if prices[i] == prices[i]:  # not NaN
+            value += amounts[i] * prices[i]
+            pnl = amounts[i] * (prices[i] - avg_prices[i])
+            pnl_out[i] = pnl
+            total_pnl += pnl
+        else:
+            pnl_out[i] = 0.0
+    return value, total_pnl
+
+
+try:
+    # Optional AOT build (python build_aot.py): same kernel as a compiled
+    # extension, so worker processes skip the JIT compile / cache load at
+    # startup entirely. Falls back to the @njit definition above.
+    from the_hand_kernels import value_and_pnl as _value_and_pnl  # noqa: F811
+except ImportError:
+    pass
+
+
+# One fixed-width record per executed trade; side codes follow the
+# SIDE_BUY/SIDE_SELL convention in utils.columnar_trade_log.
+_TRADE_DTYPE = np.dtype([('side', 'i1'), ('sym', 'i2'), ('amount', 'f8'),
+                         ('price', 'f8'), ('usd_value', 'f8'), ('ts_ns', 'i8')])
+
+
 class PortfolioManager:
     def __init__(self, initial_balance_usd=10000):
         self.balance_usd = initial_balance_usd
-        self.positions = {}  # Dictionary to store crypto positions, e.g., {'BTC': {'amount': 1.5, 'avg_price': 30000}}
-        self.trade_history = [] # List to store trade history as dictionaries
+        # Positions live in parallel arrays (struct-of-arrays) instead of a
+        # dict of per-symbol dicts: symbol_index maps symbol -> row, and
+        # valuation/PnL become contiguous float64 array math rather than a
+        # Python loop chasing dict pointers per symbol per tick.
+        self.symbol_index = {}
+        self._capacity = 16
+        self.amounts = np.zeros(self._capacity, dtype=np.float64)
+        self.avg_prices = np.zeros(self._capacity, dtype=np.float64)
+        # Trade history as one preallocated structured array: each record is
+        # a 27-byte fixed-width row instead of a dict of six Python objects,
+        # so a long backtest appends without allocating and the history reads
+        # back columnar. Symbols reuse the symbol_index interning above.
+        self._hist_capacity = 1024
+        self._hist = np.zeros(self._hist_capacity, dtype=_TRADE_DTYPE)
+        self._hist_n = 0
+        # Warm the valuation kernel on 1-element arrays so the one-time JIT
+        # compile (cache miss) happens at startup, not on the first tick.
+        _value_and_pnl(np.zeros(1), np.zeros(1), np.zeros(1), np.zeros(1))
         logger.info(f"PortfolioManager initialized with ${initial_balance_usd:.2f} initial balance.")
 
     def get_balance_usd(self):
         return self.balance_usd
 
     def get_positions(self):
-        return self.positions
+        """
+        Returns positions in the legacy dict-of-dicts shape, synthesized on
+        demand from the arrays: {'BTC': {'amount': 1.5, 'avg_price': 30000}, ...}.
+        """
+        return {
+            symbol: {'amount': self.amounts[i], 'avg_price': self.avg_prices[i]}
+            for symbol, i in self.symbol_index.items()
+        }
+
+    def get_position_amount(self, symbol):
+        """Returns the held amount for a symbol (0.0 if no position). Cheaper than
+        going through get_positions() and chained dict lookups in hot loops."""
+        i = self.symbol_index.get(symbol)
+        return self.amounts[i] if i is not None else 0.0
+
+    def _index_for(self, symbol):
+        """Returns the array row for a symbol, interning it (and growing the
+        arrays geometrically) on first appearance."""
+        i = self.symbol_index.get(symbol)
+        if i is None:
+            i = len(self.symbol_index)
+            if i == self._capacity:
+                self._capacity *= 2
+                for name in ('amounts', 'avg_prices'):
+                    grown = np.zeros(self._capacity, dtype=np.float64)
+                    grown[:i] = getattr(self, name)
+                    setattr(self, name, grown)
+            self.symbol_index[symbol] = i
+        return i
+
+    def _prices_vector(self, current_prices_usd, n):
+        """Gathers current prices into a float64 vector aligned with the
+        position arrays (NaN where no price was provided)."""
+        return np.fromiter(
+            (current_prices_usd.get(symbol, np.nan) for symbol in self.symbol_index),
+            dtype=np.float64, count=n)
 
     def update_balance(self, amount_usd):
         """Updates the USD balance."""
         self.balance_usd += amount_usd
-        logger.debug(f"Balance updated by ${amount_usd:.2f}. Current balance: ${self.balance_usd:.2f}")
+        # %-style lazy args: formatting only happens if a handler emits the
+        # record, so suppressed DEBUG costs nothing per tick.
+        logger.debug("Balance updated by $%.2f. Current balance: $%.2f", amount_usd, self.balance_usd)
 
     def update_position(self, symbol, amount_change, price):
         """
@@ -28,30 +141,21 @@ class PortfolioManager:
             amount_change (float): Change in the amount of crypto (positive for buy, negative for sell).
             price (float): Price at which the transaction occurred.
         """
-        if symbol not in self.positions:
-            self.positions[symbol] = {'amount': 0, 'avg_price': 0}
-
-        current_position = self.positions[symbol]
-        previous_amount = current_position['amount']
+        i = self._index_for(symbol)
+        previous_amount = self.amounts[i]
         current_amount = previous_amount + amount_change
 
-        if current_amount == 0:
-            # Position closed, reset avg_price
-            current_position['avg_price'] = 0
-        elif previous_amount == 0:
-            # First position, set avg_price
-            current_position['avg_price'] = price
-        else:
-            # Update average price (simplified average cost basis)
-            total_value_before = previous_amount * current_position['avg_price']
-            total_value_added = amount_change * price
-            current_position['avg_price'] = (total_value_before + total_value_added) / current_amount
-
-        current_position['amount'] = current_amount
-        self.positions[symbol] = current_position # Update the position in the dict
-        logger.debug(f"Position for {symbol} updated. Amount: {current_amount:.4f}, Avg Price: ${current_position['avg_price']:.2f}")
+        # Single select instead of the old 3-way branch: a first position
+        # (previous_amount == 0) falls out of the same arithmetic, since the
+        # numerator reduces to amount_change * price; a closed position
+        # resets to 0.
+        numer = previous_amount * self.avg_prices[i] + amount_change * price
+        self.avg_prices[i] = numer / current_amount if current_amount != 0 else 0.0
+        self.amounts[i] = current_amount
+        logger.debug("Position for %s updated. Amount: %.4f, Avg Price: $%.2f",
+                     symbol, current_amount, self.avg_prices[i])
 
-    def execute_trade(self, order_type, symbol, amount, price, timestamp=None):
+    def execute_trade(self, order_type, symbol, amount, price, timestamp=None, usd_value=None):
         """
         Executes a trade (buy or sell) and updates portfolio and trade history.
         Args:
@@ -60,37 +164,56 @@ class PortfolioManager:
             amount (float): Amount of crypto to trade.
             price (float): Execution price.
             timestamp (pd.Timestamp, optional): Timestamp of the trade. Defaults to None.
+            usd_value (float, optional): amount * price where the caller has
+                already computed it (ExecutionCoordinator does, for its trade
+                record); recomputed here otherwise.
         Returns:
             bool: True if trade executed successfully, False otherwise (e.g., insufficient balance).
         """
-        usd_value = amount * price
+        if usd_value is None:
+            usd_value = amount * price
 
+        # Balance and position mutations are inlined here rather than routed
+        # through update_balance/update_position: the happy path is called
+        # per tick in replays, and the two extra method dispatches plus their
+        # per-call debug formatting were pure overhead. The shims remain for
+        # external callers.
         if order_type == 'buy':
             if self.balance_usd >= usd_value:
-                self.update_balance(-usd_value)  # Decrease USD balance
-                self.update_position(symbol, amount, price)  # Increase crypto position
-                trade_record = {'type': 'buy', 'symbol': symbol, 'amount': amount, 'price': price, 'usd_value': usd_value,
-                                'timestamp': timestamp if timestamp else pd.Timestamp.now()}  # Use provided timestamp or default to now()
-                self.trade_history.append(trade_record)
+                self.balance_usd -= usd_value  # Decrease USD balance
+                i = self._index_for(symbol)
+                previous_amount = self.amounts[i]
+                current_amount = previous_amount + amount
+                # Branchless cost basis — the first-buy case reduces to
+                # price on its own (see update_position).
+                numer = previous_amount * self.avg_prices[i] + amount * price
+                self.avg_prices[i] = numer / current_amount if current_amount != 0 else 0.0
+                self.amounts[i] = current_amount
+                self._record_trade(1, symbol, amount, price, usd_value, timestamp)
                 logger.info(
-                    f"BUY {amount:.4f} {symbol} at ${price:.2f}, Value: ${usd_value:.2f}. New balance: ${self.balance_usd:.2f}, Position: {self.positions[symbol]['amount']:.4f} {symbol}")
+                    "BUY %.4f %s at $%.2f, Value: $%.2f. New balance: $%.2f, Position: %.4f %s",
+                    amount, symbol, price, usd_value, self.balance_usd, self.get_position_amount(symbol), symbol)
                 return True
             else:
                 logger.warning(
                     f"Insufficient USD balance to BUY {amount:.4f} {symbol} at ${price:.2f}. Available balance: ${self.balance_usd:.2f}, Required: ${usd_value:.2f}")
                 return False
         elif order_type == 'sell':
-            if symbol in self.positions and self.positions[symbol]['amount'] >= amount:
-                self.update_balance(usd_value)  # Increase USD balance
-                self.update_position(symbol, -amount, price)  # Decrease crypto position
-                trade_record = {'type': 'sell', 'symbol': symbol, 'amount': amount, 'price': price, 'usd_value': usd_value,
-                                'timestamp': timestamp if timestamp else pd.Timestamp.now()}  # Use provided timestamp or default to now()
-                self.trade_history.append(trade_record)
+            if self.get_position_amount(symbol) >= amount:
+                self.balance_usd += usd_value  # Increase USD balance
+                i = self._index_for(symbol)
+                previous_amount = self.amounts[i]
+                current_amount = previous_amount - amount
+                numer = previous_amount * self.avg_prices[i] - amount * price
+                self.avg_prices[i] = numer / current_amount if current_amount != 0 else 0.0
+                self.amounts[i] = current_amount
+                self._record_trade(-1, symbol, amount, price, usd_value, timestamp)
                 logger.info(
-                    f"SELL {amount:.4f} {symbol} at ${price:.2f}, Value: ${usd_value:.2f}. New balance: ${self.balance_usd:.2f}, Position: {self.positions[symbol]['amount']:.4f} {symbol}")
+                    "SELL %.4f %s at $%.2f, Value: $%.2f. New balance: $%.2f, Position: %.4f %s",
+                    amount, symbol, price, usd_value, self.balance_usd, self.get_position_amount(symbol), symbol)
                 return True
             else:
-                available_amount = self.positions[symbol]['amount'] if symbol in self.positions else 0
+                available_amount = self.get_position_amount(symbol)
                 logger.warning(
                     f"Insufficient {symbol} balance to SELL {amount:.4f} {symbol}. Available: {available_amount:.4f}, Requested: {amount:.4f}")
                 return False
@@ -98,6 +221,63 @@ class PortfolioManager:
             logger.error(f"Invalid order type: {order_type}. Must be 'buy' or 'sell'.")
             return False
 
+    def _record_trade(self, side, symbol, amount, price, usd_value, timestamp):
+        """Appends one fixed-width record to the trade history (side is +1
+        for buy, -1 for sell), growing the array geometrically when full."""
+        if self._hist_n == self._hist_capacity:
+            self._hist_capacity *= 2
+            grown = np.zeros(self._hist_capacity, dtype=_TRADE_DTYPE)
+            grown[:self._hist_n] = self._hist
+            self._hist = grown
+        # One raw clock syscall on the default path, versus the tz-aware
+        # object pd.Timestamp.now() builds per trade (same trade-off as
+        # ExecutionCoordinator's trade records).
+        ts_ns = timestamp.value if timestamp is not None else time.time_ns()
+        self._hist[self._hist_n] = (side, self.symbol_index[symbol], amount, price, usd_value, ts_ns)
+        self._hist_n += 1
+
+    def trade_history_df(self):
+        """
+        Materializes the trade history as a DataFrame with the legacy record
+        fields (type, symbol, amount, price, usd_value, timestamp). Symbol
+        and side rendering happens only here, never on the trade path.
+        Returns:
+            pd.DataFrame: One row per executed trade, in execution order.
+        """
+        hist = self._hist[:self._hist_n]
+        symbols = np.empty(max(len(self.symbol_index), 1), dtype=object)
+        for symbol, i in self.symbol_index.items():
+            symbols[i] = symbol
+        return pd.DataFrame({
+            'type': np.where(hist['side'] > 0, 'buy', 'sell'),
+            'symbol': symbols[hist['sym']] if self._hist_n else np.array([], dtype=object),
+            'amount': hist['amount'],
+            'price': hist['price'],
+            'usd_value': hist['usd_value'],
+            'timestamp': pd.to_datetime(hist['ts_ns'], unit='ns'),
+        })
+
+    def execute_trades(self, trades, timestamp=None):
+        """
+        Bulk variant of execute_trade for batched fills: applies the whole
+        batch in one call with a single shared timestamp (one clock read and
+        one Timestamp object for N trades instead of one each).
+        Args:
+            trades (list): Dicts with 'order_type', 'symbol', 'amount', 'price'.
+            timestamp (pd.Timestamp, optional): Timestamp shared by the batch.
+                Defaults to now.
+        Returns:
+            list: One bool per trade, in input order (same semantics as
+                  execute_trade; a failed trade does not stop the rest).
+        """
+        ts = timestamp if timestamp else pd.Timestamp.now()
+        return [
+            self.execute_trade(trade['order_type'], trade['symbol'],
+                               trade['amount'], trade['price'], timestamp=ts,
+                               usd_value=trade.get('usd_value'))
+            for trade in trades
+        ]
+
     def get_portfolio_value(self, current_prices_usd):
         """
         Calculates the total portfolio value in USD, including USD balance and crypto positions.
@@ -106,13 +286,18 @@ class PortfolioManager:
         Returns:
             float: Total portfolio value in USD.
         """
-        total_value = self.balance_usd
-        for symbol, position in self.positions.items():
-            if symbol in current_prices_usd:
-                total_value += position['amount'] * current_prices_usd[symbol]
-            else:
-                logger.warning(f"Current price for {symbol} not provided, position value not included in total portfolio value.")
-        return total_value
+        n = len(self.symbol_index)
+        if n == 0:
+            return self.balance_usd
+        prices = self._prices_vector(current_prices_usd, n)
+        missing = np.isnan(prices)
+        if missing.any():
+            for symbol, i in self.symbol_index.items():
+                if missing[i]:
+                    logger.warning(f"Current price for {symbol} not provided, position value not included in total portfolio value.")
+        value, _ = _value_and_pnl(self.amounts[:n], self.avg_prices[:n], prices,
+                                  np.empty(n, dtype=np.float64))
+        return self.balance_usd + value
 
     def calculate_pnl(self, current_prices_usd):
         """
@@ -123,17 +308,13 @@ class PortfolioManager:
             dict: Dictionary containing PnL information.
                   {'position_pnl': {'BTC': pnl_value, ...}, 'total_pnl': total_pnl_value}
         """
-        position_pnl = {}
-        total_pnl = 0
-        for symbol, position in self.positions.items():
-            if symbol in current_prices_usd and position['amount'] != 0:
-                current_value = position['amount'] * current_prices_usd[symbol]
-                cost_basis = position['amount'] * position['avg_price']
-                pnl = current_value - cost_basis
-                position_pnl[symbol] = pnl
-                total_pnl += pnl
-            else:
-                position_pnl[symbol] = 0 # Or None, if you want to indicate no PnL calculated
+        n = len(self.symbol_index)
+        if n == 0:
+            return {'position_pnl': {}, 'total_pnl': 0}
+        prices = self._prices_vector(current_prices_usd, n)
+        pnl = np.empty(n, dtype=np.float64)
+        _, total_pnl = _value_and_pnl(self.amounts[:n], self.avg_prices[:n], prices, pnl)
+        position_pnl = {symbol: pnl[i] for symbol, i in self.symbol_index.items()}
         return {'position_pnl': position_pnl, 'total_pnl': total_pnl}
 
 if __name__ == '__main__':
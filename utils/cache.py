@@ -0,0 +1,72 @@
+# utils/cache.py
+import hashlib
+import json
+import os
+import pickle
+import time
+from utils.logger import logger
+
+class FileCache:
+    """
+    Simple on-disk TTL cache. Values are pickled next to a sidecar .meta.json
+    holding the write timestamp; entries older than the TTL count as misses.
+    Used to avoid re-downloading immutable data (e.g. closed historical klines)
+    within the TTL window.
+    """
+
+    def __init__(self, base_dir='.cache', default_ttl=86400):
+        self.base_dir = base_dir
+        self.default_ttl = default_ttl
+
+    @staticmethod
+    def make_key(*parts):
+        """Derives a stable cache key from the given parts (e.g. source, symbol, interval, limit)."""
+        return hashlib.md5('|'.join(str(p) for p in parts).encode()).hexdigest()
+
+    def _paths(self, key, subdir=''):
+        directory = os.path.join(self.base_dir, subdir) if subdir else self.base_dir
+        return os.path.join(directory, f"{key}.pkl"), os.path.join(directory, f"{key}.meta.json")
+
+    def get(self, key, subdir='', ttl=None):
+        """
+        Returns the cached value for key, or None on a miss (absent, expired, or unreadable).
+        Args:
+            key (str): Cache key from make_key.
+            subdir (str): Optional subdirectory under base_dir (e.g. 'binance/BTCUSDT').
+            ttl (int, optional): Max age in seconds; defaults to default_ttl.
+        """
+        data_path, meta_path = self._paths(key, subdir)
+        ttl = ttl if ttl is not None else self.default_ttl
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if time.time() - meta['timestamp'] > ttl:
+                return None
+            with open(data_path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, KeyError, json.JSONDecodeError, pickle.UnpicklingError):
+            return None
+
+    def put(self, key, value, subdir=''):
+        """
+        Stores value under key, overwriting any previous entry.
+        Args:
+            key (str): Cache key from make_key.
+            value: Any picklable object.
+            subdir (str): Optional subdirectory under base_dir.
+        """
+        data_path, meta_path = self._paths(key, subdir)
+        try:
+            os.makedirs(os.path.dirname(data_path), exist_ok=True)
+            with open(data_path, 'wb') as f:
+                pickle.dump(value, f)
+            with open(meta_path, 'w') as f:
+                json.dump({'timestamp': time.time()}, f)
+        except OSError as e:
+            logger.error(f"Error writing cache entry {key}: {e}")
+
+if __name__ == '__main__':
+    cache = FileCache(base_dir='.cache', default_ttl=60)
+    key = FileCache.make_key('binance', 'BTCUSDT', '1h', 100)
+    cache.put(key, [[1, 2, 3]], subdir='binance/BTCUSDT')
+    print("Cached value:", cache.get(key, subdir='binance/BTCUSDT'))
@@ -0,0 +1,119 @@
+# utils/columnar_trade_log.py
+import numpy as np
+import pandas as pd
+from utils.logger import logger
+
+# Side codes match the signal convention in strategy.base_strategy
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+
+class TradeLog:
+    """
+    Column-per-field append-only trade buffer. Each append is five scalar
+    stores into preallocated ndarrays (ts_ns, symbol_id, side, amount,
+    price), with capacity doubling when full — versus one ~240-byte dict per
+    trade in a list. Analytics then build a DataFrame directly over views of
+    the columns, no list-of-dicts pivot pass per field. Symbols are interned
+    to int32 ids so the buffer stays fixed-width numeric.
+    """
+
+    def __init__(self, initial_capacity=1024):
+        self._capacity = initial_capacity
+        self.n = 0
+        self.ts_ns = np.empty(initial_capacity, dtype=np.int64)
+        self.symbol_id = np.empty(initial_capacity, dtype=np.int32)
+        self.side = np.empty(initial_capacity, dtype=np.int8)
+        self.amount = np.empty(initial_capacity, dtype=np.float64)
+        self.price = np.empty(initial_capacity, dtype=np.float64)
+        self._symbol_ids = {}   # symbol -> int32 id
+        self._symbols = []      # id -> symbol
+
+    def intern_symbol(self, symbol):
+        """Returns the stable int id for a symbol, assigning one on first use."""
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self._symbols)
+            self._symbol_ids[symbol] = symbol_id
+            self._symbols.append(symbol)
+        return symbol_id
+
+    def _grow(self):
+        """Doubles every column, amortizing reallocation to O(1) per append."""
+        self._capacity *= 2
+        for name in ('ts_ns', 'symbol_id', 'side', 'amount', 'price'):
+            column = getattr(self, name)
+            grown = np.empty(self._capacity, dtype=column.dtype)
+            grown[:self.n] = column[:self.n]
+            setattr(self, name, grown)
+
+    def append(self, ts_ns, symbol, side, amount, price):
+        """
+        Records one trade.
+        Args:
+            ts_ns (int): Trade timestamp in epoch nanoseconds.
+            symbol (str): Asset symbol (interned internally).
+            side (int): SIDE_BUY (+1) or SIDE_SELL (-1).
+            amount (float): Executed amount.
+            price (float): Executed price.
+        """
+        if self.n == self._capacity:
+            self._grow()
+        i = self.n
+        self.ts_ns[i] = ts_ns
+        self.symbol_id[i] = self.intern_symbol(symbol)
+        self.side[i] = side
+        self.amount[i] = amount
+        self.price[i] = price
+        self.n = i + 1
+
+    def to_dataframe(self):
+        """
+        Materializes the log as a DataFrame. Numeric columns are zero-copy
+        views over the buffers (treat the result as read-only); symbols and
+        timestamps are rendered lazily, only here — never on the trade path.
+        Returns:
+            pd.DataFrame: Columns timestamp, symbol, side, amount, price, usd_value.
+        """
+        n = self.n
+        symbols = np.array(self._symbols, dtype=object)
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(self.ts_ns[:n], unit='ns', utc=True),
+            'symbol': symbols[self.symbol_id[:n]] if n else np.array([], dtype=object),
+            'side': self.side[:n],
+            'amount': self.amount[:n],
+            'price': self.price[:n],
+            'usd_value': self.amount[:n] * self.price[:n],
+        })
+
+    def save(self, filepath):
+        """Dumps the filled portion of every column to one .npz file."""
+        try:
+            np.savez(filepath, ts_ns=self.ts_ns[:self.n], symbol_id=self.symbol_id[:self.n],
+                     side=self.side[:self.n], amount=self.amount[:self.n],
+                     price=self.price[:self.n], symbols=np.array(self._symbols, dtype=object))
+            logger.info("Trade log with %d trade(s) saved to %s", self.n, filepath)
+        except Exception as e:
+            logger.error(f"Error saving trade log: {e}")
+
+    @classmethod
+    def load(cls, filepath):
+        """
+        Rebuilds a TradeLog from a save()d .npz file. The columns come back
+        already typed (int64 ns timestamps, float64 amounts/prices, interned
+        symbol ids), so reloading a large log skips the string parsing a CSV
+        round-trip would pay and the result is append-ready.
+        Args:
+            filepath (str): Path to an .npz written by save().
+        Returns:
+            TradeLog: Log holding the persisted trades.
+        """
+        with np.load(filepath, allow_pickle=True) as data:
+            n = data['ts_ns'].shape[0]
+            log = cls(initial_capacity=max(n, 1024))
+            for name in ('ts_ns', 'symbol_id', 'side', 'amount', 'price'):
+                getattr(log, name)[:n] = data[name]
+            log.n = n
+            log._symbols = list(data['symbols'])
+            log._symbol_ids = {symbol: i for i, symbol in enumerate(log._symbols)}
+        return log
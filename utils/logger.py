@@ -3,7 +3,14 @@ import logging
 import config  # Import your config.py file
 
 def setup_logger(log_level=config.LOG_LEVEL):
-    """Sets up a basic logger."""
+    """Sets up a basic logger. Idempotent: once the root logger has handlers
+    (this process, or a parent that forked worker processes), the existing
+    chain is reused instead of registering another handler — re-imports in a
+    multi-worker sweep would otherwise multiply every emitted record."""
+    root = logging.getLogger()
+    if root.handlers:
+        return logging.getLogger('the_hand')
+
     numeric_level = getattr(logging, log_level.upper(), None)
     if not isinstance(numeric_level, int):
         raise ValueError(f'Invalid log level: {log_level}')
@@ -13,7 +20,9 @@ def setup_logger(log_level=config.LOG_LEVEL):
         format='%(asctime)s - %(levelname)s - %(module)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    return logging.getLogger(__name__) # Or you can use a more specific name
+    # One shared named logger for the whole package, so every module sees the
+    # same level and isEnabledFor gates behave uniformly.
+    return logging.getLogger('the_hand')
 
 logger = setup_logger() # Initialize the logger
 
@@ -22,4 +31,4 @@ if __name__ == '__main__':
     logger.info("This is an info message")
     logger.warning("This is a warning message")
     logger.error("This is an error message")
-    logger.critical("This is a critical message")
\ No newline at end of file
+    logger.critical("This is a critical message")
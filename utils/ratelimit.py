@@ -0,0 +1,68 @@
+# utils/ratelimit.py
+import asyncio
+import threading
+import time
+
+class TokenBucket:
+    """
+    Client-side token bucket sized to Binance's 1200 weight/min request budget.
+    Bursting past the budget earns HTTP 429s with multi-second retry-after
+    penalties, so concurrent fetchers pace themselves here instead. Thread-safe;
+    usable from both blocking code (acquire) and coroutines (acquire_async).
+    """
+
+    def __init__(self, capacity=1200, refill_per_sec=20):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(float(self.capacity),
+                           self._tokens + (now - self._last_refill) * self.refill_per_sec)
+        self._last_refill = now
+
+    def _reserve(self, weight):
+        """Debits weight tokens and returns how long the caller must wait (0 if none)."""
+        with self._lock:
+            self._refill()
+            self._tokens -= weight
+            if self._tokens >= 0:
+                return 0.0
+            # Over-committed: wait until refills cover the deficit.
+            return -self._tokens / self.refill_per_sec
+
+    def acquire(self, weight=1):
+        """Blocks until the request may proceed within the weight budget."""
+        delay = self._reserve(weight)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, weight=1):
+        """Async variant of acquire; sleeps on the event loop instead of blocking."""
+        delay = self._reserve(weight)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def sync_used_weight(self, used_weight):
+        """
+        Aligns local tokens with the server-reported X-MBX-USED-WEIGHT-1M header,
+        draining extra tokens if the server has seen more usage than we tracked
+        (e.g. other clients sharing the API key).
+        Args:
+            used_weight (int): Weight the server reports as used in the current minute.
+        """
+        with self._lock:
+            self._refill()
+            server_remaining = float(self.capacity - used_weight)
+            if server_remaining < self._tokens:
+                self._tokens = server_remaining
+
+if __name__ == '__main__':
+    bucket = TokenBucket(capacity=5, refill_per_sec=5)
+    start = time.monotonic()
+    for i in range(10):
+        bucket.acquire(weight=1)
+    print(f"10 acquisitions against a 5-token bucket took {time.monotonic() - start:.2f}s")